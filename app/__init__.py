@@ -699,11 +699,20 @@ def register_template_filters(app):
         get_field_display_value,
         can_view_relationship,
         can_view_ned_content,
-        get_ned_field_value,
+        ned_field_value_for_access,
         get_permission_level_name
     )
     from flask_login import current_user
 
+    def _current_user_can_view_ned():
+        """NED Team access for current_user, resolved once per request"""
+        # Keyed by user id so a login/logout mid-request is not served stale
+        user_id = current_user.get_id()
+        cached = g.get('ned_allowed')
+        if cached is None or cached[0] != user_id:
+            cached = g.ned_allowed = (user_id, can_view_ned_content(current_user))
+        return cached[1]
+
     @app.template_filter('can_view_field')
     def can_view_field_filter(table_name, record_id, field_name, user=None):
         """
@@ -756,7 +765,7 @@ def register_template_filters(app):
             {% endif %}
         """
         if user is None:
-            user = current_user
+            return _current_user_can_view_ned()
         return can_view_ned_content(user)
 
     @app.template_filter('ned_field_value')
@@ -767,7 +776,9 @@ def register_template_filters(app):
         Usage in template:
             {{ client|ned_field_value('relationship_notes') }}
         """
-        return get_ned_field_value(current_user, entity, field_name, redaction_message)
+        return ned_field_value_for_access(
+            _current_user_can_view_ned(), entity, field_name, redaction_message
+        )
 
     @app.template_filter('permission_level')
     def permission_level_filter(user=None):
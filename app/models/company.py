@@ -135,6 +135,7 @@ class CompanyRoleAssignment(Base, TimestampMixin):
         Index('idx_company_role_company', 'company_id'),
         Index('idx_company_role_role', 'role_id'),
         Index('idx_company_role_context', 'context_type', 'context_id'),
+        Index('idx_cra_role_ctxtype_ctxid', 'role_id', 'context_type', 'context_id'),
         Index('idx_company_role_primary', 'is_primary'),
     )
 
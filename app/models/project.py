@@ -8,7 +8,7 @@ from sqlalchemy import Column, Integer, Text, Float, Date, ForeignKey, Index, La
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from .base import Base, TimestampMixin
-from app.utils.encryption import EncryptedField
+from app.utils.encryption import EncryptedField, bulk_insert_encrypted
 
 
 class Project(Base, TimestampMixin):
@@ -116,6 +116,23 @@ class Project(Base, TimestampMixin):
     def __repr__(self):
         return f'<Project {self.project_name}>'
 
+    @classmethod
+    def bulk_insert_encrypted(cls, session, rows):
+        """
+        Insert many projects in one statement, encrypting financial fields
+
+        Skips the ORM flush and EncryptedField descriptor; see
+        app.utils.encryption.bulk_insert_encrypted.
+
+        Args:
+            session: SQLAlchemy session
+            rows: List of dicts keyed by attribute name (e.g. 'project_name', 'capex')
+
+        Returns:
+            int: Number of rows inserted
+        """
+        return bulk_insert_encrypted(session, cls, rows)
+
     def to_dict(self, user=None):
         """
         Convert to dictionary, respecting confidentiality
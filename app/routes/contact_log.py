@@ -169,29 +169,35 @@ def _update_company_contact_metrics(company_id: int):
         client_profile = ClientProfile(company_id=company_id)
         db_session.add(client_profile)
 
-    # Query contact logs - support both 'Company' and legacy entity types
-    logs = db_session.query(ContactLog).filter(
-        (ContactLog.entity_type == 'Company') |
-        (ContactLog.entity_type.in_(['Owner', 'Vendor', 'Developer', 'Client'])),
-        ContactLog.entity_id == company_id
-    ).order_by(ContactLog.contact_date.desc(), ContactLog.contact_id.desc()).all()
-
-    if logs:
-        latest = logs[0]
-        client_profile.last_contact_by = latest.contacted_by
-    else:
-        client_profile.last_contact_by = None
+    # Support both 'Company' and legacy entity types; both lookups are
+    # resolved in SQL on idx_contact_log_entity instead of loading every log
+    company_logs = (
+        ContactLog.entity_type.in_(['Company', 'Owner', 'Vendor', 'Developer', 'Client']),
+        ContactLog.entity_id == company_id,
+    )
 
-    # Determine next planned contact (earliest future follow-up)
-    upcoming = [log for log in logs if log.follow_up_needed and log.follow_up_date]
-    upcoming = [log for log in upcoming if log.follow_up_date > date.today()]
+    latest = (
+        db_session.query(ContactLog.contacted_by)
+        .filter(*company_logs)
+        .order_by(ContactLog.contact_date.desc(), ContactLog.contact_id.desc())
+        .first()
+    )
+    client_profile.last_contact_by = latest.contacted_by if latest else None
 
-    if upcoming:
-        upcoming.sort(key=lambda l: (l.follow_up_date, l.contact_id))
-        next_contact = upcoming[0]
-        client_profile.next_planned_contact_assigned_to = next_contact.follow_up_assigned_to
-    else:
-        client_profile.next_planned_contact_assigned_to = None
+    # Determine next planned contact (earliest future follow-up)
+    next_contact = (
+        db_session.query(ContactLog.follow_up_assigned_to)
+        .filter(
+            *company_logs,
+            ContactLog.follow_up_needed.is_(True),
+            ContactLog.follow_up_date > date.today(),
+        )
+        .order_by(ContactLog.follow_up_date, ContactLog.contact_id)
+        .first()
+    )
+    client_profile.next_planned_contact_assigned_to = (
+        next_contact.follow_up_assigned_to if next_contact else None
+    )
 
 
 def _redirect_after_save(entity_type: str, entity_id: int):
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, List, Any
 
-from sqlalchemy import func
+from sqlalchemy import and_, func
 
 from app import db_session
 from app.models import Company, CompanyRole, CompanyRoleAssignment
@@ -16,16 +16,15 @@ def get_company_counts_by_role() -> Dict[str, int]:
     Returns:
         Dictionary mapping role codes to counts of distinct companies
     """
-    roles = db_session.query(CompanyRole).all()
-    counts = {}
-
-    for role in roles:
-        count = db_session.query(func.count(func.distinct(CompanyRoleAssignment.company_id))).filter(
-            CompanyRoleAssignment.role_id == role.role_id
-        ).scalar() or 0
-        counts[role.role_code] = count
+    # One round-trip for every role instead of a role lookup plus a COUNT each
+    rows = (
+        db_session.query(CompanyRole.role_code, func.count(func.distinct(CompanyRoleAssignment.company_id)))
+        .outerjoin(CompanyRoleAssignment, CompanyRoleAssignment.role_id == CompanyRole.role_id)
+        .group_by(CompanyRole.role_id, CompanyRole.role_code)
+        .all()
+    )
 
-    return counts
+    return {role_code: count for role_code, count in rows}
 
 
 def get_companies_by_role(role_code: str) -> List[Company]:
@@ -38,21 +37,17 @@ def get_companies_by_role(role_code: str) -> List[Company]:
     Returns:
         List of Company objects with that role
     """
-    role = db_session.query(CompanyRole).filter(CompanyRole.role_code == role_code).first()
-    if not role:
-        return []
-
-    company_ids = (
-        db_session.query(CompanyRoleAssignment.company_id)
-        .filter(CompanyRoleAssignment.role_id == role.role_id)
+    # Resolve the role, its assignments and the companies in one statement
+    return (
+        db_session.query(Company)
+        .join(CompanyRoleAssignment, CompanyRoleAssignment.company_id == Company.company_id)
+        .join(CompanyRole, CompanyRole.role_id == CompanyRoleAssignment.role_id)
+        .filter(CompanyRole.role_code == role_code)
         .distinct()
+        .order_by(Company.company_name)
         .all()
     )
 
-    company_ids = [cid[0] for cid in company_ids]
-
-    return db_session.query(Company).filter(Company.company_id.in_(company_ids)).order_by(Company.company_name).all()
-
 
 def get_companies_for_project(project_id: int) -> Dict[str, List[Dict[str, Any]]]:
     """
@@ -106,20 +101,21 @@ def get_project_participation_summary() -> Dict[str, Any]:
         .scalar() or 0
     )
 
-    # Count project assignments by role
-    role_assignments = {}
-    roles = db_session.query(CompanyRole).all()
-
-    for role in roles:
-        count = (
-            db_session.query(func.count(CompanyRoleAssignment.assignment_id))
-            .filter(
-                CompanyRoleAssignment.role_id == role.role_id,
+    # Count project assignments by role in one grouped query; the outer join
+    # keeps roles without project assignments at zero
+    role_counts = (
+        db_session.query(CompanyRole.role_code, func.count(CompanyRoleAssignment.assignment_id))
+        .outerjoin(
+            CompanyRoleAssignment,
+            and_(
+                CompanyRoleAssignment.role_id == CompanyRole.role_id,
                 CompanyRoleAssignment.context_type == 'Project'
             )
-            .scalar() or 0
         )
-        role_assignments[role.role_code] = count
+        .group_by(CompanyRole.role_id, CompanyRole.role_code)
+        .all()
+    )
+    role_assignments = {role_code: count for role_code, count in role_counts}
 
     return {
         'companies_with_projects': companies_with_projects,
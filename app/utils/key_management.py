@@ -8,7 +8,8 @@ machine-local auto-generated keys.
 """
 
 import os
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Optional
 from cryptography.fernet import Fernet
 from app.exceptions import EncryptionKeyError
 
@@ -27,6 +28,8 @@ class KeyManager:
     NED_TEAM = 'ned_team'
 
     _keys: Optional[Dict[str, bytes]] = None
+    _ciphers: Dict[str, Fernet] = {}
+    _encrypt_cache: Optional[Callable[[str, bytes], bytes]] = None
 
     @classmethod
     def _load_keys(cls) -> Dict[str, bytes]:
@@ -56,6 +59,8 @@ class KeyManager:
                 "the same keys on every authorized machine."
             )
 
+        # Ciphers built from previously loaded keys are no longer valid
+        cls._ciphers = {}
         cls._keys = {
             cls.CONFIDENTIAL: confidential_key.encode() if isinstance(confidential_key, str) else confidential_key,
             cls.NED_TEAM: ned_team_key.encode() if isinstance(ned_team_key, str) else ned_team_key,
@@ -97,8 +102,51 @@ class KeyManager:
         Returns:
             Fernet: Cipher instance for encryption/decryption
         """
-        key = cls.get_key(key_type)
-        return Fernet(key)
+        # Built once per key type; Fernet() re-decodes and splits the key.
+        # _load_keys() is a no-op once loaded and resets _ciphers on reload.
+        cls._load_keys()
+        cipher = cls._ciphers.get(key_type)
+        if cipher is None:
+            cipher = cls._ciphers[key_type] = Fernet(cls.get_key(key_type))
+        return cipher
+
+    @classmethod
+    def encrypt(cls, key_type: str, value_bytes: bytes) -> bytes:
+        """
+        Encrypt plaintext bytes with a specific key type
+
+        Uses the test ciphertext cache when enable_test_cache() is active.
+
+        Args:
+            key_type: 'confidential' or 'ned_team'
+            value_bytes: Plaintext bytes
+
+        Returns:
+            bytes: Fernet token
+        """
+        if cls._encrypt_cache is not None:
+            return cls._encrypt_cache(key_type, value_bytes)
+        return cls.get_cipher(key_type).encrypt(value_bytes)
+
+    @classmethod
+    def enable_test_cache(cls, maxsize: int = 512):
+        """
+        Memoize ciphertext per (key_type, plaintext) for test runs
+
+        Fernet tokens normally differ on every call (random IV and
+        timestamp). With the cache on, repeated plaintexts return the same
+        token, which leaks equality - never enable this outside tests.
+        """
+        @lru_cache(maxsize=maxsize)
+        def _encrypt(key_type: str, value_bytes: bytes) -> bytes:
+            return cls.get_cipher(key_type).encrypt(value_bytes)
+
+        cls._encrypt_cache = _encrypt
+
+    @classmethod
+    def disable_test_cache(cls):
+        """Turn off the test ciphertext cache"""
+        cls._encrypt_cache = None
 
     @classmethod
     def get_keys_for_user(cls, user) -> Dict[str, bytes]:
@@ -142,11 +190,31 @@ class KeyManager:
         if not user or not user.is_authenticated:
             return False
 
+        return cls.flags_can_access_key(
+            key_type,
+            bool(user.has_confidential_access),
+            bool(user.is_ned_team),
+            bool(user.is_admin),
+        )
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def flags_can_access_key(cls, key_type: str, has_confidential_access: bool,
+                             is_ned_team: bool, is_admin: bool) -> bool:
+        """
+        Key access rule for an authenticated user's permission flags
+
+        Cached per combination (few exist); user_can_access_key and
+        PermissionBasedEncryption.get_user_key_access both use it.
+
+        Returns:
+            bool: True if the flags grant access to key_type
+        """
         if key_type == cls.CONFIDENTIAL:
-            return user.has_confidential_access or user.is_admin
+            return has_confidential_access or is_admin
 
         if key_type == cls.NED_TEAM:
-            return user.is_ned_team or user.is_admin
+            return is_ned_team or is_admin
 
         return False
 
@@ -191,6 +259,9 @@ class KeyManager:
         Useful for testing or key rotation
         """
         cls._keys = None
+        cls._ciphers = {}
+        if cls._encrypt_cache is not None:
+            cls._encrypt_cache.cache_clear()
         cls._load_keys()
 
 
@@ -3,10 +3,11 @@ Two-Tier Permission System for NukeWorks
 Implements field-level and relationship-level confidentiality
 Following docs/05_PERMISSION_SYSTEM.md specification
 """
-from functools import wraps
+from functools import lru_cache, wraps
+from typing import NamedTuple
 from flask import flash, redirect, url_for, abort, current_app
 from flask_login import current_user
-from app.models import ConfidentialFieldFlag
+from app.models import ConfidentialFieldFlag, User
 
 
 def get_db_session():
@@ -41,8 +42,9 @@ def can_view_field(user, table_name, record_id, field_name):
         >>> can_view_field(current_user, 'projects', 45, 'capex')
         True  # If user has confidential access or field is not flagged
     """
-    # Admin has access to everything
-    if user and user.is_admin:
+    # Admin and confidential-access users can see every field, flagged or
+    # not, so answer before touching ConfidentialFieldFlag
+    if user and (user.is_admin or user.has_confidential_access):
         return True
 
     # Check if field is flagged as confidential
@@ -53,15 +55,51 @@ def can_view_field(user, table_name, record_id, field_name):
         field_name=field_name
     ).first()
 
-    # If no flag exists or flag says not confidential, field is public
-    if not flag or not flag.is_confidential:
-        return True
+    # If no flag exists or flag says not confidential, field is public;
+    # otherwise the user lacks confidential access
+    return not flag or not flag.is_confidential
 
-    # Field is confidential - check user permission
-    if user:
-        return user.has_confidential_access or user.is_admin
 
-    return False
+def can_view_fields_bulk(user, table_name, record_id, field_names):
+    """
+    Check several fields of one record with a single flag query
+
+    Same rules as can_view_field(), but loads every ConfidentialFieldFlag for
+    (table_name, record_id) at once instead of one query per field.
+
+    Args:
+        user: User object (or current_user)
+        table_name: Name of database table (e.g., 'projects')
+        record_id: ID of the specific record
+        field_names: Iterable of field names to check
+
+    Returns:
+        dict: field_name -> Boolean (True if user can view the field)
+
+    Examples:
+        >>> can_view_fields_bulk(current_user, 'projects', 45, ['capex', 'opex'])
+        {'capex': False, 'opex': True}
+    """
+    field_names = list(field_names)
+
+    if user and (user.is_admin or user.has_confidential_access):
+        return dict.fromkeys(field_names, True)
+
+    db_session = get_db_session()
+    flags = {}
+    # Ordered by flag_id so the first flag per field wins, as in can_view_field()
+    for field_name, is_confidential in (
+        db_session.query(ConfidentialFieldFlag.field_name, ConfidentialFieldFlag.is_confidential)
+        .filter(
+            ConfidentialFieldFlag.table_name == table_name,
+            ConfidentialFieldFlag.record_id == record_id,
+            ConfidentialFieldFlag.field_name.in_(field_names),
+        )
+        .order_by(ConfidentialFieldFlag.flag_id)
+    ):
+        flags.setdefault(field_name, is_confidential)
+
+    return {field_name: not flags.get(field_name, False) for field_name in field_names}
 
 
 def get_field_display_value(user, entity, field_name, table_name=None, redaction_message="[Confidential]"):
@@ -87,17 +125,16 @@ def get_field_display_value(user, entity, field_name, table_name=None, redaction
 
     # Get the actual value
     actual_value = getattr(entity, field_name, None)
+    if actual_value is None:
+        return None
 
-    # Get primary key value (assumes field named {table}_id or id)
     pk_field = f"{table_name.rstrip('s')}_id" if hasattr(entity, f"{table_name.rstrip('s')}_id") else 'id'
     record_id = getattr(entity, pk_field, None)
 
-    if record_id and can_view_field(user, table_name, record_id, field_name):
-        return actual_value
-    elif actual_value is not None and not can_view_field(user, table_name, record_id, field_name):
-        return redaction_message
-    else:
+    # One flag lookup decides between the value and the redaction
+    if can_view_field(user, table_name, record_id, field_name):
         return actual_value
+    return redaction_message
 
 
 def can_view_relationship(user, relationship):
@@ -220,12 +257,41 @@ def mark_financial_fields_confidential(project_id, is_confidential=True, user_id
         List[ConfidentialFieldFlag]: List of flags created/updated
     """
     financial_fields = ['capex', 'opex', 'fuel_cost', 'lcoe']
-    flags = []
+    db_session = get_db_session()
 
+    # confidential_field_flags has no unique key to upsert against, so load
+    # the existing flags in one query and write all four in one commit
+    existing = {}
+    for flag in (
+        db_session.query(ConfidentialFieldFlag)
+        .filter(
+            ConfidentialFieldFlag.table_name == 'projects',
+            ConfidentialFieldFlag.record_id == project_id,
+            ConfidentialFieldFlag.field_name.in_(financial_fields),
+        )
+        .order_by(ConfidentialFieldFlag.flag_id)
+    ):
+        existing.setdefault(flag.field_name, flag)
+
+    flags = []
     for field in financial_fields:
-        flag = mark_field_confidential('projects', project_id, field, is_confidential, user_id)
+        flag = existing.get(field)
+        if flag:
+            flag.is_confidential = is_confidential
+            if user_id:
+                flag.marked_by = user_id
+        else:
+            flag = ConfidentialFieldFlag(
+                table_name='projects',
+                record_id=project_id,
+                field_name=field,
+                is_confidential=is_confidential,
+                marked_by=user_id
+            )
+            db_session.add(flag)
         flags.append(flag)
 
+    db_session.commit()
     return flags
 
 
@@ -233,6 +299,13 @@ def mark_financial_fields_confidential(project_id, is_confidential=True, user_id
 # TIER 2: NED TEAM ACCESS (INTERNAL NOTES)
 # =============================================================================
 
+# Fields redacted by filter_ned_fields() for users without NED Team access
+NED_FIELDS = frozenset({
+    'relationship_notes',
+    'client_priority',
+})
+
+
 def can_view_ned_content(user):
     """
     Check if user can view NED Team content (Tier 2: Internal Notes)
@@ -266,14 +339,31 @@ def get_ned_field_value(user, entity, field_name, redaction_message="[NED Team O
     Returns:
         Value or redaction message
     """
-    if can_view_ned_content(user):
-        return getattr(entity, field_name, None)
-    else:
-        # Check if field has a value
-        actual_value = getattr(entity, field_name, None)
-        if actual_value:
-            return redaction_message
-        return None
+    return ned_field_value_for_access(
+        can_view_ned_content(user), entity, field_name, redaction_message
+    )
+
+
+def ned_field_value_for_access(can_view_ned, entity, field_name, redaction_message="[NED Team Only]"):
+    """
+    Get value for a NED Team-restricted field given an already-resolved
+    access decision (e.g. cached once per request)
+
+    Args:
+        can_view_ned: Whether the viewer has NED Team access
+        entity: Entity with NED fields
+        field_name: Name of NED field
+        redaction_message: Message for non-NED users
+
+    Returns:
+        Value or redaction message
+    """
+    value = getattr(entity, field_name, None)
+    if can_view_ned:
+        return value
+
+    # Only redact fields that actually have a value
+    return redaction_message if value else None
 
 
 def filter_ned_fields(user, entity):
@@ -287,22 +377,18 @@ def filter_ned_fields(user, entity):
     Returns:
         dict: Entity data with NED fields redacted if necessary
     """
-    NED_FIELDS = [
-        'relationship_notes',
-        'client_priority',
-    ]
-
     if isinstance(entity, dict):
         data = entity.copy()
     else:
         data = entity.to_dict() if hasattr(entity, 'to_dict') else {}
 
-    if not can_view_ned_content(user):
-        for field in NED_FIELDS:
-            if field in data and data[field]:
-                data[field] = "[NED Team Only]"
+    if can_view_ned_content(user):
+        return data
 
-    return data
+    return {
+        field: "[NED Team Only]" if field in NED_FIELDS and value else value
+        for field, value in data.items()
+    }
 
 
 # =============================================================================
@@ -428,14 +514,43 @@ def get_user_permission_summary(user):
     Returns:
         dict: Summary of permissions
     """
+    if not user:
+        return dict(_permission_summary(False, False, False, False))
+
+    return dict(_permission_summary(
+        bool(user.is_authenticated),
+        bool(user.is_admin),
+        bool(user.has_confidential_access),
+        bool(user.is_ned_team),
+    ))
+
+
+class _PermissionFlags(NamedTuple):
+    """Just the permission flags of a user, enough to call the User rule methods"""
+    is_authenticated: bool
+    is_admin: bool
+    has_confidential_access: bool
+    is_ned_team: bool
+
+
+@lru_cache(maxsize=32)
+def _permission_summary(is_authenticated, is_admin, has_confidential_access, is_ned_team):
+    """Summary for one combination of permission flags (at most 16 exist)
+
+    The can_* values come from the User methods themselves, so the rules
+    live in one place.
+    """
+    flags = _PermissionFlags(is_authenticated, is_admin, has_confidential_access, is_ned_team)
     return {
-        'is_admin': user.is_admin if user else False,
-        'has_confidential_access': user.has_confidential_access if user else False,
-        'is_ned_team': user.is_ned_team if user else False,
-        'can_view_confidential': user.can_view_confidential() if user else False,
-        'can_view_ned': user.can_view_ned_content() if user else False,
-        'can_manage_users': user.can_manage_users() if user else False,
-        'permission_level': get_permission_level_name(user)
+        'is_admin': is_admin,
+        'has_confidential_access': has_confidential_access,
+        'is_ned_team': is_ned_team,
+        'can_view_confidential': bool(User.can_view_confidential(flags)),
+        'can_view_ned': bool(User.can_view_ned_content(flags)),
+        'can_manage_users': bool(User.can_manage_users(flags)),
+        'permission_level': _permission_level_name(
+            is_authenticated, is_admin, has_confidential_access, is_ned_team
+        ),
     }
 
 
@@ -449,16 +564,26 @@ def get_permission_level_name(user):
     Returns:
         str: Permission level name
     """
-    if not user or not user.is_authenticated:
+    if not user:
+        return _permission_level_name(False, False, False, False)
+
+    return _permission_level_name(
+        user.is_authenticated, user.is_admin, user.has_confidential_access, user.is_ned_team
+    )
+
+
+def _permission_level_name(is_authenticated, is_admin, has_confidential_access, is_ned_team):
+    """Permission level name for a set of permission flags"""
+    if not is_authenticated:
         return "Not Authenticated"
 
-    if user.is_admin:
+    if is_admin:
         return "Administrator"
 
     parts = []
-    if user.has_confidential_access:
+    if has_confidential_access:
         parts.append("Confidential Access")
-    if user.is_ned_team:
+    if is_ned_team:
         parts.append("NED Team")
 
     if parts:
@@ -16,6 +16,14 @@ class ValidationError(Exception):
 # COMMON FIELD VALIDATION
 # =============================================================================
 
+# Translate tables deleting control characters (code points below 32);
+# text areas may keep newline, carriage return and tab
+_CONTROL_CHARS = dict.fromkeys(range(32))
+_CONTROL_CHARS_EXCEPT_WHITESPACE = {
+    code: None for code in _CONTROL_CHARS if chr(code) not in '\n\r\t'
+}
+
+
 def validate_string_field(value, field_name, max_length=255, required=True, allow_newlines=False):
     """
     Standard string field validation
@@ -57,13 +65,10 @@ def validate_string_field(value, field_name, max_length=255, required=True, allo
     if len(value) > max_length:
         raise ValidationError(f"{field_name} exceeds maximum length of {max_length}")
 
-    # Check for invalid control characters
-    if allow_newlines:
-        invalid_chars = [c for c in value if ord(c) < 32 and c not in ['\n', '\r', '\t']]
-    else:
-        invalid_chars = [c for c in value if ord(c) < 32]
-
-    if invalid_chars:
+    # Check for invalid control characters (translate drops them; any change
+    # in length means one was present)
+    invalid_table = _CONTROL_CHARS_EXCEPT_WHITESPACE if allow_newlines else _CONTROL_CHARS
+    if len(value.translate(invalid_table)) != len(value):
         raise ValidationError(f"{field_name} contains invalid characters")
 
     return value
@@ -158,6 +163,13 @@ def validate_date_field(value, field_name, allow_future=True, allow_past=True):
     return date_obj
 
 
+# Built once at import; validate_email/validate_phone run on every form save
+_EMAIL_RE = re.compile(r'^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$')
+# Deletes the characters phone validation counts (digits and '+'); the
+# count is the length difference, so any other character is ignored
+_PHONE_COUNTED_CHARS = str.maketrans('', '', '0123456789+')
+
+
 def validate_email(email, field_name="email"):
     """
     Email validation
@@ -184,9 +196,7 @@ def validate_email(email, field_name="email"):
     email = email.strip().lower()
 
     # Basic email regex pattern
-    pattern = r'^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$'
-
-    if not re.match(pattern, email):
+    if not _EMAIL_RE.match(email):
         raise ValidationError(f"{field_name} must be a valid email address")
 
     return email
@@ -217,10 +227,10 @@ def validate_phone(phone, field_name="phone"):
 
     phone = phone.strip()
 
-    # Extract digits for validation
-    digits = re.sub(r'[^0-9+]', '', phone)
+    # Count digits for validation
+    digit_count = len(phone) - len(phone.translate(_PHONE_COUNTED_CHARS))
 
-    if len(digits) < 10:
+    if digit_count < 10:
         raise ValidationError(f"{field_name} must contain at least 10 digits")
 
     return phone  # Store as entered (preserves formatting)
@@ -239,6 +249,15 @@ VALID_LICENSING_APPROACHES = ['Research Reactor', 'Part 50', 'Part 52']
 VALID_CONTACT_TYPES = ['In-person', 'Phone', 'Email', 'Video', 'Conference']
 VALID_RELATIONSHIP_TYPES = ['MOU', 'Development_Agreement', 'Delivery_Contract', 'Other']
 
+# The lists above keep display order (form choices, error messages);
+# membership checks use these hashed copies
+_COMPANY_TYPES_SET = frozenset(VALID_COMPANY_TYPES)
+_ENGAGEMENT_LEVELS_SET = frozenset(VALID_ENGAGEMENT_LEVELS)
+_PROJECT_STATUSES_SET = frozenset(VALID_PROJECT_STATUSES)
+_LICENSING_APPROACHES_SET = frozenset(VALID_LICENSING_APPROACHES)
+_CONTACT_TYPES_SET = frozenset(VALID_CONTACT_TYPES)
+_RELATIONSHIP_TYPES_SET = frozenset(VALID_RELATIONSHIP_TYPES)
+
 
 def validate_contact_date(contact_date):
     """Validate contact_date cannot be in the future"""
@@ -286,7 +305,7 @@ def validate_company_type(value):
     """Validate company_type field"""
     if value is None:
         return None
-    if value not in VALID_COMPANY_TYPES:
+    if value not in _COMPANY_TYPES_SET:
         raise ValidationError(f"company_type must be one of: {', '.join(VALID_COMPANY_TYPES)}")
     return value
 
@@ -295,7 +314,7 @@ def validate_engagement_level(value):
     """Validate engagement_level field"""
     if value is None:
         return None
-    if value not in VALID_ENGAGEMENT_LEVELS:
+    if value not in _ENGAGEMENT_LEVELS_SET:
         raise ValidationError(f"engagement_level must be one of: {', '.join(VALID_ENGAGEMENT_LEVELS)}")
     return value
 
@@ -304,7 +323,7 @@ def validate_project_status(value):
     """Validate project_status field"""
     if value is None:
         return None
-    if value not in VALID_PROJECT_STATUSES:
+    if value not in _PROJECT_STATUSES_SET:
         raise ValidationError(f"project_status must be one of: {', '.join(VALID_PROJECT_STATUSES)}")
     return value
 
@@ -313,7 +332,7 @@ def validate_licensing_approach(value):
     """Validate licensing_approach field"""
     if value is None:
         return None
-    if value not in VALID_LICENSING_APPROACHES:
+    if value not in _LICENSING_APPROACHES_SET:
         raise ValidationError(f"licensing_approach must be one of: {', '.join(VALID_LICENSING_APPROACHES)}")
     return value
 
@@ -322,7 +341,7 @@ def validate_contact_type(value):
     """Validate contact_type field"""
     if value is None:
         return None
-    if value not in VALID_CONTACT_TYPES:
+    if value not in _CONTACT_TYPES_SET:
         raise ValidationError(f"contact_type must be one of: {', '.join(VALID_CONTACT_TYPES)}")
     return value
 
@@ -331,7 +350,7 @@ def validate_relationship_type(value):
     """Validate relationship_type field"""
     if value is None:
         return None
-    if value not in VALID_RELATIONSHIP_TYPES:
+    if value not in _RELATIONSHIP_TYPES_SET:
         raise ValidationError(f"relationship_type must be one of: {', '.join(VALID_RELATIONSHIP_TYPES)}")
     return value
 
@@ -381,14 +400,13 @@ def validate_unique_username(username, user_id=None):
     if not db_session:
         db_session = current_app.db_session
 
-    query = db_session.query(User).filter(User.username.ilike(username))
+    query = db_session.query(User.user_id).filter(User.username.ilike(username))
 
     if user_id is not None:
         query = query.filter(User.user_id != user_id)
 
-    existing = query.first()
-
-    if existing:
+    # EXISTS probe - only presence matters, so no User is loaded
+    if db_session.query(query.exists()).scalar():
         raise ValidationError(f"Username '{username}' is already taken")
 
 
@@ -409,25 +427,24 @@ def validate_unique_email(email, user_id=None):
     if not db_session:
         db_session = current_app.db_session
 
-    query = db_session.query(User).filter(User.email.ilike(email))
+    query = db_session.query(User.user_id).filter(User.email.ilike(email))
 
     if user_id is not None:
         query = query.filter(User.user_id != user_id)
 
-    existing = query.first()
-
-    if existing:
+    # EXISTS probe - only presence matters, so no User is loaded
+    if db_session.query(query.exists()).scalar():
         raise ValidationError(f"Email '{email}' is already registered")
 
 
 # Common weak passwords list (subset - expand as needed)
-# Store in lowercase for case-insensitive comparison
-COMMON_PASSWORDS = {
+# Currently unused: validate_password_strength has no complexity checks.
+# Entries are stored lowercase for a future case-insensitive lookup.
+COMMON_PASSWORDS = frozenset({
     'password', 'password123', '12345678', 'qwerty', 'abc123',
     'password1', 'admin', 'admin123', 'letmein', 'welcome',
     'monkey', '1234567890', 'password!', 'pa$$w0rd', 'p@ssw0rd',
-    'Password123'  # Add mixed case version
-}
+})
 
 
 def validate_password_strength(password, username=None):
@@ -548,16 +565,15 @@ def validate_unique_company_name(company_name, company_id=None):
     if not db_session:
         db_session = current_app.db_session
 
-    query = db_session.query(Company).filter(
+    query = db_session.query(Company.company_id).filter(
         Company.company_name.ilike(company_name)
     )
 
     if company_id is not None:
         query = query.filter(Company.company_id != company_id)
 
-    existing = query.first()
-
-    if existing:
+    # EXISTS probe - only presence matters, so no Company is loaded
+    if db_session.query(query.exists()).scalar():
         raise ValidationError(f"Company '{company_name}' already exists")
 
 
@@ -578,14 +594,13 @@ def check_duplicate_project_name(project_name, project_id=None):
     if not db_session:
         db_session = current_app.db_session
 
-    query = db_session.query(Project).filter(Project.project_name.ilike(project_name))
+    query = db_session.query(Project.project_id).filter(Project.project_name.ilike(project_name))
 
     if project_id is not None:
         query = query.filter(Project.project_id != project_id)
 
-    existing = query.first()
-
-    if existing:
+    # EXISTS probe - only presence matters, so no Project is loaded
+    if db_session.query(query.exists()).scalar():
         return f"Warning: A project named '{project_name}' already exists"
 
     return None
@@ -734,26 +749,32 @@ def collect_validation_errors(validators):
     Run multiple validators and collect all errors
 
     Args:
-        validators: List of (validator_func, args) tuples
+        validators: Iterable of zero-argument callables, or of
+            (validator_func, args) tuples
 
     Returns:
         List of validation error messages
 
     Example:
         >>> errors = collect_validation_errors([
-        ...     (validate_string_field, ("", "vendor_name")),
+        ...     lambda: validate_string_field("", "vendor_name"),
         ...     (validate_email, ("invalid",))
         ... ])
         >>> print(errors)
         ['vendor_name cannot be empty', 'email must be a valid email address']
     """
     errors = []
+    append = errors.append
 
-    for validator_func, args in validators:
+    for validator in validators:
         try:
-            validator_func(*args)
+            if callable(validator):
+                validator()
+            else:
+                validator_func, args = validator
+                validator_func(*args)
         except ValidationError as e:
-            errors.append(str(e))
+            append(str(e))
 
     return errors
 
@@ -189,7 +189,7 @@ class Config:
     # Migration settings
     MIGRATIONS_DIR = str(MIGRATIONS_ROOT)
     APPLICATION_VERSION = '1.0.0'
-    REQUIRED_SCHEMA_VERSION = 20  # Add Engineer company role
+    REQUIRED_SCHEMA_VERSION = 21  # Add role/context index on company_role_assignments
 
     # Report settings
     COMPANY_NAME = 'MPR Associates'
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import os
+import sys
 from pathlib import Path
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 
 # Tests should not depend on developer-local .env files or AppData state.
@@ -12,7 +14,15 @@ os.environ.setdefault('CONFIDENTIAL_DATA_KEY', 'ljDoOzaiZ5_1n3EiKoCbyL7TDEqHc6Js
 os.environ.setdefault('NED_TEAM_KEY', 'lCRatlKRIlEE4-04Pjp1q_OIyYnkdrQRiU_6swEVJHw=')
 
 import app as app_module
-from app.models import Base
+from app.models import Base, SchemaVersion, User
+from app.utils.migrations import get_required_schema_version
+
+# The suite database is throwaway: keep WAL (set by the app) but skip the
+# per-commit fsync and keep temp tables in memory
+TEST_SQLITE_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+)
 
 
 @pytest.fixture(scope='session')
@@ -39,12 +49,35 @@ def app(_database_path: Path):
 
     flask_app = app_module.create_app('testing')
 
+    # create_app() opens no database; bind the temp file the same way the
+    # db selector does and use it as the default session for the suite
+    engine, session = app_module.get_or_create_engine_session(str(_database_path), flask_app)
+
+    @event.listens_for(engine, 'connect')
+    def _set_test_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in TEST_SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+    app_module._default_db_session = session
+    flask_app.db_session = session
+
     # Recreate the schema explicitly to ensure a clean slate
-    engine = app_module.db_session.get_bind()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
 
+    # Stamp the schema as current so the login database check accepts it
+    session.add(SchemaVersion(
+        version=get_required_schema_version(),
+        applied_by='pytest',
+        description='Schema created by test suite',
+    ))
+    session.commit()
+
     flask_app.testing = True
+    # Templates don't change during a run; skip the per-render mtime check
+    flask_app.config['TEMPLATES_AUTO_RELOAD'] = False
+    flask_app.jinja_env.auto_reload = False
     return flask_app
 
 
@@ -54,24 +87,69 @@ def db_session(app):
     return app.db_session
 
 
+@pytest.fixture(scope='session')
+def admin_user(app, db_session):
+    """Active admin account (admin / admin123) shared across the suite."""
+    user = db_session.query(User).filter_by(username='admin').first()
+    if user is None:
+        user = User(username='admin', email='admin@example.com', full_name='Admin', is_admin=True)
+        user.set_password('admin123')
+        db_session.add(user)
+        db_session.commit()
+    return user
+
+
+@pytest.fixture(scope='session')
+def encrypted_money():
+    """(plaintext, ciphertext) for a confidential amount, encrypted once per run."""
+    from app.utils.encryption import encrypt_confidential
+
+    plaintext = "$5,000,000"
+    return plaintext, encrypt_confidential(plaintext)
+
+
+@pytest.fixture
+def app_context(app):
+    """Push an application context for helpers that resolve the app session."""
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app, _database_path, tmp_path, monkeypatch):
+    """Test client with the suite database selected in its session."""
+    from app.utils import db_selector_cache
+
+    # Keep login's recent-path bookkeeping out of the repo's instance folder
+    monkeypatch.setattr(db_selector_cache, 'get_cache_file_path', lambda: tmp_path / 'db_selector.json')
+
+    with app.test_client() as test_client:
+        with test_client.session_transaction() as sess:
+            sess['selected_db_path'] = str(_database_path)
+        yield test_client
+
+
 @pytest.fixture(scope='session')
 def _wire_test_modules(app):
     """Point test helper modules at the active database session."""
     try:
         from tests import test_permissions  # type: ignore
-        test_permissions.db_session = app.db_session
-    except ImportError:
-        pass
-    try:
-        from tests import test_validators  # type: ignore
-        test_validators.db_session = app.db_session
     except ImportError:
         pass
+    else:
+        test_permissions.db_session = app.db_session
+
+    # pytest may also have imported these files under their bare module
+    # names (rootdir-relative import without tests/__init__.py)
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, '__file__', None) or ''
+        if Path(module_file).name == 'test_permissions.py':
+            module.db_session = app.db_session
     yield
 
 
-@pytest.fixture(scope='function')
-def permission_dataset(app, db_session):
+@pytest.fixture(scope='module')
+def permission_dataset(app, db_session, _wire_test_modules):
     """Set up users, project, and relationships used across permission tests."""
     from tests.test_permissions import (
         setup_test_users,
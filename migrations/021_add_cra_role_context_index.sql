@@ -0,0 +1,22 @@
+-- Add a composite index for role-filtered company role assignment lookups.
+-- Reports and analytics filter company_role_assignments on role_id together
+-- with context_type/context_id; this lets SQLite answer those from the index
+-- alone instead of intersecting idx_company_role_role and
+-- idx_company_role_context.
+
+BEGIN TRANSACTION;
+
+CREATE INDEX IF NOT EXISTS idx_cra_role_ctxtype_ctxid
+    ON company_role_assignments(role_id, context_type, context_id);
+
+INSERT INTO schema_version (version, applied_date, applied_by, description)
+SELECT
+    21,
+    datetime('now'),
+    'system',
+    'Add idx_cra_role_ctxtype_ctxid on company_role_assignments'
+WHERE NOT EXISTS (
+    SELECT 1 FROM schema_version WHERE version = 21
+);
+
+COMMIT;
@@ -16,12 +16,13 @@ def main(config_name: str | None = None) -> None:
     with app.app_context():
         session = app_module.db_session
         total_companies = session.query(app_module.models.Company).count()
-        assignments = session.query(CompanyRoleAssignment).all()
-        role_lookup = {role.role_id: role.role_label for role in session.query(CompanyRole).all()}
+        # Only role ids/labels are needed, so fetch column tuples rather than ORM objects
+        assignment_role_ids = session.query(CompanyRoleAssignment.role_id).all()
+        role_lookup = dict(session.query(CompanyRole.role_id, CompanyRole.role_label).all())
 
         counts = Counter()
-        for assignment in assignments:
-            counts[role_lookup.get(assignment.role_id, str(assignment.role_id))] += 1
+        for (role_id,) in assignment_role_ids:
+            counts[role_lookup.get(role_id, str(role_id))] += 1
 
         print(f"Total companies: {total_companies}")
         for role, count in sorted(counts.items(), key=lambda item: item[0]):
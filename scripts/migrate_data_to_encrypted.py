@@ -19,8 +19,10 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-load_dotenv()
+# Only read .env when the encryption keys are not already exported (CI)
+if not (os.environ.get('CONFIDENTIAL_DATA_KEY') and os.environ.get('NED_TEAM_KEY')):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 from sqlalchemy import create_engine, text
 from app.utils.encryption import encrypt_confidential, encrypt_value
@@ -70,11 +72,14 @@ def check_encrypted_columns_exist(engine):
 
     with engine.connect() as conn:
         missing_columns = []
+        table_columns = {}
 
         for table, old_col, new_col, key_type in FIELD_MIGRATIONS:
-            # Check if encrypted column exists
-            result = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
-            columns = [row[1] for row in result]
+            # Check if encrypted column exists (one PRAGMA per table, not per field)
+            columns = table_columns.get(table)
+            if columns is None:
+                result = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
+                columns = table_columns[table] = {row[1] for row in result}
 
             if new_col not in columns:
                 missing_columns.append(f"{table}.{new_col}")
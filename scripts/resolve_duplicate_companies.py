@@ -5,12 +5,15 @@ import argparse
 import os
 import sys
 from collections import defaultdict
-from typing import List
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import raiseload
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import app as app_module
-from app.models import Company, CompanyRoleAssignment, PersonCompanyAffiliation
+from app.models import Company, CompanyRole, CompanyRoleAssignment, PersonCompanyAffiliation
 
 
 def normalize_name(name: str) -> str:
@@ -19,75 +22,123 @@ def normalize_name(name: str) -> str:
 
 
 def find_duplicates(session) -> dict:
-    """Find all companies with duplicate names."""
-    companies = session.query(Company).all()
-    name_map = defaultdict(list)
+    """Find all companies with duplicate names.
 
-    for company in companies:
-        normalized = normalize_name(company.company_name)
-        name_map[normalized].append(company)
+    Only (company_id, company_name) pairs are fetched to group names by
+    normalize_name() (SQLite's lower()/trim() would only fold ASCII case and
+    spaces); full Company rows are then loaded just for the duplicates.
+    """
+    ids_by_name = defaultdict(list)
+    for company_id, company_name in session.query(Company.company_id, Company.company_name):
+        ids_by_name[normalize_name(company_name)].append(company_id)
+
+    key_by_id = {
+        company_id: name
+        for name, company_ids in ids_by_name.items() if len(company_ids) > 1
+        for company_id in company_ids
+    }
+    if not key_by_id:
+        return {}
 
-    # Filter to only duplicates
-    duplicates = {name: comps for name, comps in name_map.items() if len(comps) > 1}
-    return duplicates
+    duplicates = defaultdict(list)
+    for company in (
+        session.query(Company)
+        .options(raiseload('*'))
+        .filter(Company.company_id.in_(key_by_id))
+        .order_by(Company.company_id)
+    ):
+        duplicates[key_by_id[company.company_id]].append(company)
 
+    return dict(duplicates)
 
-def analyze_company(session, company: Company) -> dict:
-    """Analyze a company record to understand its usage."""
-    role_assignments = session.query(CompanyRoleAssignment).filter_by(
-        company_id=company.company_id
-    ).all()
 
-    affiliations = session.query(PersonCompanyAffiliation).filter_by(
-        company_id=company.company_id
-    ).all()
+def load_role_codes(session) -> Dict[int, str]:
+    """Map role_id to role_code for every company role (static reference data)."""
+    return dict(session.query(CompanyRole.role_id, CompanyRole.role_code).all())
+
+
+def analyze_companies(session, companies: List[Company], role_codes: Dict[int, str]) -> List[dict]:
+    """Analyze a group of company records to understand their usage.
 
-    # Group assignments by context
-    contexts = defaultdict(list)
-    for assignment in role_assignments:
-        key = f"{assignment.context_type}:{assignment.context_id}" if assignment.context_id else "Global"
-        contexts[key].append({
-            'role': assignment.role.role_code if assignment.role else 'unknown',
-            'is_primary': assignment.is_primary,
-            'is_confidential': assignment.is_confidential,
+    Role assignments for the whole group are fetched with one IN query and
+    affiliations with one grouped COUNT, rather than per company. Role codes
+    come from the preloaded ``role_codes`` map instead of a join.
+    """
+    company_ids = [company.company_id for company in companies]
+
+    role_assignments = defaultdict(list)
+    for assignment in (
+        session.query(CompanyRoleAssignment)
+        .options(raiseload('*'))
+        .filter(CompanyRoleAssignment.company_id.in_(company_ids))
+        .all()
+    ):
+        role_assignments[assignment.company_id].append(assignment)
+
+    # Only the number of affiliations is reported, so count them in SQL
+    affiliation_counts = dict(
+        session.query(PersonCompanyAffiliation.company_id, func.count(PersonCompanyAffiliation.affiliation_id))
+        .filter(PersonCompanyAffiliation.company_id.in_(company_ids))
+        .group_by(PersonCompanyAffiliation.company_id)
+        .all()
+    )
+
+    analyses = []
+    for company in companies:
+        assignments = role_assignments[company.company_id]
+
+        # Group assignments by context
+        contexts = defaultdict(list)
+        for assignment in assignments:
+            key = f"{assignment.context_type}:{assignment.context_id}" if assignment.context_id else "Global"
+            contexts[key].append({
+                'role': role_codes.get(assignment.role_id, 'unknown'),
+                'is_primary': assignment.is_primary,
+                'is_confidential': assignment.is_confidential,
+            })
+
+        analyses.append({
+            'company_id': company.company_id,
+            'company_name': company.company_name,
+            'company_type': company.company_type,
+            'is_mpr_client': company.is_mpr_client,
+            'role_assignments': len(assignments),
+            'affiliations': affiliation_counts.get(company.company_id, 0),
+            'contexts': dict(contexts),
+            'created_date': company.created_date,
+            'modified_date': company.modified_date,
         })
 
-    return {
-        'company_id': company.company_id,
-        'company_name': company.company_name,
-        'company_type': company.company_type,
-        'is_mpr_client': company.is_mpr_client,
-        'role_assignments': len(role_assignments),
-        'affiliations': len(affiliations),
-        'contexts': dict(contexts),
-        'created_date': company.created_date,
-        'modified_date': company.modified_date,
-    }
+    return analyses
 
 
-def print_duplicate_group(session, name: str, companies: List[Company]) -> None:
+def print_duplicate_group(name: str, companies: List[Company], analyses: List[dict]) -> None:
     """Print detailed analysis of a duplicate group."""
-    print(f'\n{"=" * 80}')
-    print(f'Duplicate Name: "{companies[0].company_name}"')
-    print(f'Normalized: "{name}"')
-    print(f'Instances: {len(companies)}')
-    print('=' * 80)
-
-    for i, company in enumerate(companies, 1):
-        analysis = analyze_company(session, company)
-        print(f'\n[{i}] Company ID: {analysis["company_id"]}')
-        print(f'    Type: {analysis["company_type"] or "Not set"}')
-        print(f'    MPR Client: {analysis["is_mpr_client"]}')
-        print(f'    Role Assignments: {analysis["role_assignments"]}')
-        print(f'    Personnel Affiliations: {analysis["affiliations"]}')
-        print(f'    Created: {analysis["created_date"]}')
-        print(f'    Modified: {analysis["modified_date"]}')
+    # Build the whole block and write it once rather than a print per line
+    lines = [
+        f'\n{"=" * 80}',
+        f'Duplicate Name: "{companies[0].company_name}"',
+        f'Normalized: "{name}"',
+        f'Instances: {len(companies)}',
+        '=' * 80,
+    ]
+
+    for i, analysis in enumerate(analyses, 1):
+        lines.append(f'\n[{i}] Company ID: {analysis["company_id"]}')
+        lines.append(f'    Type: {analysis["company_type"] or "Not set"}')
+        lines.append(f'    MPR Client: {analysis["is_mpr_client"]}')
+        lines.append(f'    Role Assignments: {analysis["role_assignments"]}')
+        lines.append(f'    Personnel Affiliations: {analysis["affiliations"]}')
+        lines.append(f'    Created: {analysis["created_date"]}')
+        lines.append(f'    Modified: {analysis["modified_date"]}')
 
         if analysis['contexts']:
-            print(f'    Contexts:')
+            lines.append('    Contexts:')
             for context, roles in analysis['contexts'].items():
                 role_str = ', '.join([r['role'] for r in roles])
-                print(f'      - {context}: {role_str}')
+                lines.append(f'      - {context}: {role_str}')
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def suggest_merge_strategy(companies: List[dict]) -> dict:
@@ -141,54 +192,59 @@ def merge_companies(session, keep_id: int, merge_ids: List[int], dry_run: bool =
         'companies_deleted': 0,
     }
 
-    for merge_id in merge_ids:
-        # Move role assignments
-        assignments = session.query(CompanyRoleAssignment).filter_by(
-            company_id=merge_id
-        ).all()
+    # Keys already held by the kept company, loaded once so each moved row
+    # is a set lookup instead of its own SELECT
+    kept_assignment_keys = set(
+        session.query(
+            CompanyRoleAssignment.role_id,
+            CompanyRoleAssignment.context_type,
+            CompanyRoleAssignment.context_id,
+        ).filter(CompanyRoleAssignment.company_id == keep_id).all()
+    )
+    kept_affiliation_keys = set(
+        session.query(
+            PersonCompanyAffiliation.person_id,
+            PersonCompanyAffiliation.title,
+        ).filter(PersonCompanyAffiliation.company_id == keep_id).all()
+    )
 
-        for assignment in assignments:
-            # Check if equivalent assignment exists
-            existing = session.query(CompanyRoleAssignment).filter_by(
-                company_id=keep_id,
-                role_id=assignment.role_id,
-                context_type=assignment.context_type,
-                context_id=assignment.context_id,
-            ).first()
-
-            if existing:
-                # Duplicate assignment, just delete the old one
-                if not dry_run:
-                    session.delete(assignment)
-            else:
-                # Move to kept company
-                if not dry_run:
-                    assignment.company_id = keep_id
-                stats['role_assignments_moved'] += 1
-
-        # Move affiliations
-        affiliations = session.query(PersonCompanyAffiliation).filter_by(
-            company_id=merge_id
-        ).all()
-
-        for affiliation in affiliations:
-            # Check if equivalent affiliation exists
-            existing = session.query(PersonCompanyAffiliation).filter_by(
-                person_id=affiliation.person_id,
-                company_id=keep_id,
-                title=affiliation.title,
-            ).first()
-
-            if existing:
-                # Duplicate, delete old one
-                if not dry_run:
-                    session.delete(affiliation)
-            else:
-                # Move to kept company
-                if not dry_run:
-                    affiliation.company_id = keep_id
-                stats['affiliations_moved'] += 1
+    # Move role assignments
+    assignments = session.query(CompanyRoleAssignment).options(raiseload('*')).filter(
+        CompanyRoleAssignment.company_id.in_(merge_ids)
+    ).all()
 
+    for assignment in assignments:
+        key = (assignment.role_id, assignment.context_type, assignment.context_id)
+        if key in kept_assignment_keys:
+            # Duplicate assignment, just delete the old one
+            if not dry_run:
+                session.delete(assignment)
+        else:
+            # Move to kept company
+            if not dry_run:
+                assignment.company_id = keep_id
+            kept_assignment_keys.add(key)
+            stats['role_assignments_moved'] += 1
+
+    # Move affiliations
+    affiliations = session.query(PersonCompanyAffiliation).options(raiseload('*')).filter(
+        PersonCompanyAffiliation.company_id.in_(merge_ids)
+    ).all()
+
+    for affiliation in affiliations:
+        key = (affiliation.person_id, affiliation.title)
+        if key in kept_affiliation_keys:
+            # Duplicate, delete old one
+            if not dry_run:
+                session.delete(affiliation)
+        else:
+            # Move to kept company
+            if not dry_run:
+                affiliation.company_id = keep_id
+            kept_affiliation_keys.add(key)
+            stats['affiliations_moved'] += 1
+
+    for merge_id in merge_ids:
         # Delete the merged company
         if not dry_run:
             company = session.get(Company, merge_id)
@@ -211,11 +267,11 @@ def interactive_resolution(session) -> None:
         return
 
     print(f'\nFound {len(duplicates)} sets of duplicate companies.\n')
+    role_codes = load_role_codes(session)
 
     for name, companies in duplicates.items():
-        print_duplicate_group(session, name, companies)
-
-        analyses = [analyze_company(session, c) for c in companies]
+        analyses = analyze_companies(session, companies, role_codes)
+        print_duplicate_group(name, companies, analyses)
         suggestion = suggest_merge_strategy(analyses)
 
         print(f'\n{"-" * 80}')
@@ -261,10 +317,11 @@ def run_duplicate_report(session) -> None:
         return
 
     print(f'Found {len(duplicates)} sets of duplicate companies:')
+    role_codes = load_role_codes(session)
 
     for name, companies in duplicates.items():
-        print_duplicate_group(session, name, companies)
-        analyses = [analyze_company(session, c) for c in companies]
+        analyses = analyze_companies(session, companies, role_codes)
+        print_duplicate_group(name, companies, analyses)
         suggestion = suggest_merge_strategy(analyses)
         print(f'\n  SUGGESTION: {suggestion["reasoning"]}\n')
 
@@ -3,14 +3,17 @@
 Randomly assign Tier and Priority to all MPR clients for roundtable matrix testing.
 """
 
+import os
 import sys
 import random
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-load_dotenv()
+# Only read .env when the encryption keys are not already exported (CI)
+if not (os.environ.get('CONFIDENTIAL_DATA_KEY') and os.environ.get('NED_TEAM_KEY')):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -12,10 +12,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from cryptography.fernet import Fernet
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Only read .env when the encryption keys are not already exported (CI)
+if not (os.environ.get('CONFIDENTIAL_DATA_KEY') and os.environ.get('NED_TEAM_KEY')):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 
 def test_key_loading():
@@ -65,18 +66,20 @@ def test_encryption_decryption():
 
     # Encrypt
     print("\nEncrypting...")
-    encrypted_data = {}
-    for key, value in test_data.items():
-        encrypted = cipher.encrypt(value.encode('utf-8'))
-        encrypted_data[key] = encrypted
+    encrypt = cipher.encrypt
+    plaintexts = [value.encode('utf-8') for value in test_data.values()]
+    encrypted_data = dict(zip(test_data, [encrypt(p) for p in plaintexts]))
+    for key, encrypted in encrypted_data.items():
         print(f"  {key}: {encrypted[:40]}... ({len(encrypted)} bytes)")
 
     # Decrypt
     print("\nDecrypting...")
-    decrypted_data = {}
-    for key, encrypted in encrypted_data.items():
-        decrypted = cipher.decrypt(encrypted).decode('utf-8')
-        decrypted_data[key] = decrypted
+    decrypt = cipher.decrypt
+    decrypted_data = {
+        key: decrypt(encrypted).decode('utf-8')
+        for key, encrypted in encrypted_data.items()
+    }
+    for key, decrypted in decrypted_data.items():
         print(f"  {key}: {decrypted}")
 
     # Verify
@@ -4,14 +4,17 @@ Manual test runner for encryption utilities
 Bypasses pytest to avoid conftest import issues
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-load_dotenv()
+# Only read .env when the encryption keys are not already exported (CI)
+if not (os.environ.get('CONFIDENTIAL_DATA_KEY') and os.environ.get('NED_TEAM_KEY')):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Import test functions
 from tests.test_encryption_utils import *
@@ -4,13 +4,26 @@
 Update client profiles with strategic data from JSON
 """
 
+import argparse
 import json
+import mmap
 import sqlite3
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import sys
 import io
 
+try:
+    import ijson  # optional: streams the extraction file one client at a time
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: faster whole-file parse when ijson is absent
+except ImportError:
+    orjson = None
+
 # Fix encoding for Windows
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -18,89 +31,224 @@ if sys.platform == 'win32':
 DB_PATH = Path("C:/Users/jimbu/Coding Projects/NukeWorks/databases/development/dev_nukeworks.sqlite")
 JSON_PATH = Path("C:/Users/jimbu/Coding Projects/temp/docs/AI_RESEARCH_EXTRACTION_2025-10-18.json")
 
-def load_json_data():
-    """Load the JSON extraction file"""
-    with open(JSON_PATH, 'r') as f:
-        return json.load(f)
+# client_profiles.company_id is the INTEGER PRIMARY KEY (rowid alias, see
+# migration 005), so WHERE company_id = ? / IN (...) already seeks the table
+# B-tree directly; a separate company_id index would only add write cost.
+
+# Profile columns the extraction may carry. Only the keys present in a
+# client's profile are written, so missing keys never overwrite real values.
+CLIENT_PROFILE_COLUMNS = (
+    'client_priority',
+    'client_status',
+    'relationship_strength',
+    'relationship_notes',
+    'last_contact_date',
+    'last_contact_type',
+)
+MAX_CASE_BATCH = 400
+
+def iter_clients():
+    """Yield client entries from the JSON extraction file
+
+    Uses ijson when installed so only one client is held in memory at a
+    time. Otherwise the whole file is parsed: with orjson straight from a
+    read-only memory map (no decoded str copy), else with json.
+    """
+    with open(JSON_PATH, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'clients.item')
+        elif orjson is not None:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
+            yield from data['clients']
+        else:
+            yield from json.load(f)['clients']
 
 def get_db_connection():
-    """Get database connection"""
-    return sqlite3.connect(str(DB_PATH))
+    """Get database connection
 
-def update_client_profile(conn, company_id, client_profile_data):
-    """Update client profile record"""
-    cursor = conn.cursor()
+    Uses the stdlib sqlite3 driver: every bound value is a str, int or None
+    (no adapters or detect_types), and the merged CASE update issues one
+    statement per batch, so a faster driver such as apsw has no per-row
+    overhead left to remove.
+    """
+    conn = sqlite3.connect(str(DB_PATH))
+    # WAL + NORMAL sync: the single batch commit below costs one fsync
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    return conn
 
-    try:
-        cursor.execute("""
-            UPDATE client_profiles
-            SET client_priority = ?,
-                client_status = ?,
-                relationship_strength = ?,
-                relationship_notes = ?,
-                last_contact_date = ?,
-                last_contact_type = ?,
-                modified_date = ?,
-                modified_by = ?
-            WHERE company_id = ?
-        """, (
-            client_profile_data.get('client_priority', 'Unknown'),
-            client_profile_data.get('client_status', 'Active'),
-            client_profile_data.get('relationship_strength', 'New'),
-            client_profile_data.get('relationship_notes', ''),
-            client_profile_data.get('last_contact_date'),
-            client_profile_data.get('last_contact_type'),
-            datetime.now().isoformat(),
-            1,  # system user
-            company_id
-        ))
+@lru_cache(maxsize=64)
+def build_update_sql(columns):
+    """Per-row UPDATE for one set of present columns
+
+    Cached by column tuple (at most 2**6 shapes); returning the same string
+    object also keeps sqlite3's statement cache hit on every reuse.
+    """
+    set_clauses = "".join(f"{column} = ?, " for column in columns)
+    return (
+        f"UPDATE client_profiles SET {set_clauses}modified_date = ?, modified_by = ? "
+        "WHERE company_id = ?"
+    )
+
+def build_update_row(client_profile_data, company_id, run_ts):
+    """Build (columns, params) for one client profile
+
+    columns lists the CLIENT_PROFILE_COLUMNS present in the profile; params
+    matches build_update_sql(columns). run_ts is the run's modified_date,
+    taken once in main() for every row.
+    """
+    columns = tuple(column for column in CLIENT_PROFILE_COLUMNS if column in client_profile_data)
+    params = tuple(client_profile_data[column] for column in columns) + (
+        run_ts,
+        1,  # system user
+        company_id,
+    )
+    return columns, params
+
+def build_case_update(columns, rows):
+    """Merge many client profile updates into one CASE WHEN UPDATE
+
+    All rows must share the same columns. Returns (sql, params) for a
+    single statement that sets those columns per company_id and is limited
+    to those ids with WHERE company_id IN (...).
+    """
+    whens = " ".join(["WHEN ? THEN ?"] * len(rows))
+    set_clauses = "".join(
+        f"{column} = CASE company_id {whens} END,\n        " for column in columns
+    )
+    placeholders = ", ".join(["?"] * len(rows))
+    sql = f"""
+    UPDATE client_profiles
+    SET {set_clauses}modified_date = ?,
+        modified_by = ?
+    WHERE company_id IN ({placeholders})
+"""
+
+    params = []
+    for index in range(len(columns)):
+        for _, row_params in rows:
+            params.extend((row_params[-1], row_params[index]))
+    params.extend(rows[0][1][-3:-1])
+    params.extend(row_params[-1] for _, row_params in rows)
+    return sql, params
+
+def case_batch_size(conn, columns):
+    """Largest batch whose CASE update stays under the bound-variable limit"""
+    # Two variables per column per company, one for the IN list, plus
+    # modified_date and modified_by
+    per_row = 2 * len(columns) + 1
+    max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    return max(1, min(MAX_CASE_BATCH, (max_variables - 2) // per_row))
+
+def update_client_profiles(cursor, rows):
+    """Apply all client profile updates in one transaction
+
+    Rows are grouped by the columns they set and each group is merged into
+    CASE WHEN updates of up to MAX_CASE_BATCH companies. Returns the number
+    of rows updated, or None if the batch failed. A failed batch is rolled
+    back and replayed row by row as a diagnostic only: the replay runs in
+    one transaction that is rolled back again, so nothing is applied; it
+    just reports the offending company_ids. The caller's cursor is reused
+    for every statement.
+    """
+    conn = cursor.connection
+    # One row per company; the last entry wins, as with sequential UPDATEs
+    rows = list({params[-1]: (columns, params) for columns, params in rows}.values())
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[0], []).append(row)
 
+    try:
+        # Take the write lock up front so the batch never fails mid-way
+        # on a lock upgrade
+        cursor.execute("BEGIN IMMEDIATE")
+        updated = 0
+        for columns, group in groups.items():
+            batch_size = case_batch_size(conn, columns)
+            for start in range(0, len(group), batch_size):
+                cursor.execute(*build_case_update(columns, group[start:start + batch_size]))
+                updated += cursor.rowcount
         conn.commit()
-        return cursor.rowcount > 0
+        return updated
     except Exception as e:
-        print(f"  ! Error updating client profile for company_id {company_id}: {e}")
-        return False
+        conn.rollback()
+        print(f"  ! Batch update failed ({e}); nothing was applied")
+        print("  ! Replaying row by row (diagnostic only, rolled back) to find failing rows")
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        for columns, params in rows:
+            try:
+                cursor.execute(build_update_sql(columns), params)
+            except sqlite3.Error as e:
+                print(f"  ! Error updating client profile for company_id {params[-1]}: {e}")
+    finally:
+        conn.rollback()
+    return None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the profile values read for each client",
+    )
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     print("=" * 80)
     print("Client Profiles Update - AI Research Extraction")
     print("=" * 80)
     print()
 
-    # Load data
-    print("Loading JSON data...")
-    data = load_json_data()
-    print(f"[OK] Loaded extraction for {len(data['clients'])} clients")
-    print()
-
     # Connect to database
     conn = get_db_connection()
+    cursor = conn.cursor()
     print("[OK] Connected to database")
     print()
 
-    # Statistics
-    profiles_updated = 0
-
-    # Process each client
-    for client_entry in data['clients']:
+    # Stream the extraction, collecting one parameter tuple per client
+    print(f"Reading {JSON_PATH.name}...")
+    print()
+    run_ts = datetime.now().isoformat()
+    clients_read = 0
+    clients_skipped = 0
+    rows = []
+    # Per-client detail is only gathered with --verbose and written in one go
+    details = [] if args.verbose else None
+    for client_entry in iter_clients():
+        clients_read += 1
         company_data = client_entry['external_client']
-        company_name = company_data['company_name']
         company_id = company_data['company_id']
+        client_profile = client_entry.get('client_profile')
+
+        columns, params = build_update_row(client_profile or {}, company_id, run_ts)
+        if columns:
+            rows.append((columns, params))
+        else:
+            clients_skipped += 1
 
-        print(f"Processing: {company_name} (ID: {company_id})")
-
-        # Update client profile
-        if 'client_profile' in client_entry:
-            result = update_client_profile(conn, company_id, client_entry['client_profile'])
-            if result:
-                print(f"  [UPDATE] Client profile updated")
-                print(f"    Priority: {client_entry['client_profile'].get('client_priority')}")
-                print(f"    Status: {client_entry['client_profile'].get('client_status')}")
-                print(f"    Strength: {client_entry['client_profile'].get('relationship_strength')}")
-                profiles_updated += 1
+        if details is not None:
+            details.append(f"Processing: {company_data['company_name']} (ID: {company_id})")
+            if columns:
+                details.extend(
+                    f"    {column}: {value}" for column, value in zip(columns, params)
+                )
             else:
-                print(f"  [SKIP] No changes made")
-        print()
+                details.append("  [SKIP] No client profile fields")
+            details.append("")
+
+    if details:
+        print("\n".join(details))
+
+    # Apply every update in a single transaction
+    profiles_updated = update_client_profiles(cursor, rows)
 
     # Close connection
     conn.close()
@@ -109,6 +257,15 @@ def main():
     print("=" * 80)
     print("UPDATE SUMMARY")
     print("=" * 80)
+    print(f"Clients Read:                {clients_read}")
+    print(f"Clients Without Profile:     {clients_skipped}")
+    if profiles_updated is None:
+        print("Client Profiles Updated:     0 (batch rolled back)")
+        print()
+        print("[FAILED] No client profiles were updated; fix the rows reported above and rerun.")
+        print()
+        sys.exit(1)
+
     print(f"Client Profiles Updated:     {profiles_updated}")
     print()
     print("[OK] Update complete!")
@@ -2,10 +2,21 @@ import argparse
 import os
 import sqlite3
 
+READ_ONLY_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 def run_checks(db_path: str) -> None:
     db_path = os.path.normpath(db_path)
     con = sqlite3.connect(db_path)
+    # Read-only check script: reject writes, skip sync work, and read the
+    # schema pages through mmap instead of read() calls
+    for pragma in READ_ONLY_PRAGMAS:
+        con.execute(pragma)
     cur = con.cursor()
     print(f"DB: {db_path}")
 
@@ -14,20 +25,20 @@ def run_checks(db_path: str) -> None:
         return cur.fetchall()
 
     print("roles:", q("SELECT role_id, role_code FROM company_roles WHERE role_code IN ('owner','developer') ORDER BY role_code"))
-    print(
-        "owner_assignments:",
+    # Both role counts in one grouped scan instead of a subquery per role
+    assignment_counts = dict(
         q(
-            "SELECT COUNT(*) FROM company_role_assignments WHERE role_id IN (SELECT role_id FROM company_roles WHERE role_code='owner')"
-        ),
-    )
-    print(
-        "developer_assignments:",
-        q(
-            "SELECT COUNT(*) FROM company_role_assignments WHERE role_id IN (SELECT role_id FROM company_roles WHERE role_code='developer')"
-        ),
+            "SELECT cr.role_code, COUNT(*) FROM company_role_assignments cra "
+            "JOIN company_roles cr ON cra.role_id = cr.role_id "
+            "WHERE cr.role_code IN ('owner','developer') GROUP BY cr.role_code"
+        )
     )
+    print("owner_assignments:", assignment_counts.get("owner", 0))
+    print("developer_assignments:", assignment_counts.get("developer", 0))
     print("indexes:", q("PRAGMA index_list('company_role_assignments')"))
     print("idx_info:", q("PRAGMA index_info('idx_cra_unique')"))
+    # Added by migration 021; missing here means the DB is below schema 21
+    print("role_context_idx_info:", q("PRAGMA index_info('idx_cra_role_ctxtype_ctxid')"))
     print(
         "legacy_tables:",
         q(
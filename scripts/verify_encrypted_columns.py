@@ -8,7 +8,18 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import create_engine, text
+from collections import defaultdict
+
+from sqlalchemy import bindparam, create_engine, event, text
+
+# The script only reads schema metadata, so connections are opened with
+# writes disabled and the durability/IO work SQLite does by default turned off
+READ_ONLY_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
 
 
 def verify_columns(db_path):
@@ -22,6 +33,13 @@ def verify_columns(db_path):
 
     engine = create_engine(f'sqlite:///{db_path}')
 
+    @event.listens_for(engine, "connect")
+    def set_read_only_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in READ_ONLY_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
     expected_columns = {
         'projects': ['capex_encrypted', 'opex_encrypted', 'fuel_cost_encrypted', 'lcoe_encrypted'],
         'client_profiles': ['relationship_strength_encrypted', 'relationship_notes_encrypted',
@@ -34,20 +52,30 @@ def verify_columns(db_path):
 
     all_good = True
 
+    # Every (table, column) pair in one statement: the SQLite dialect's
+    # get_multi_columns() still issues a PRAGMA table_info per table
+    columns_query = text(
+        "SELECT m.name, p.name FROM sqlite_master m "
+        "JOIN pragma_table_info(m.name) p "
+        "WHERE m.type = 'table' AND m.name IN :tables"
+    ).bindparams(bindparam('tables', expanding=True))
+
+    table_columns = defaultdict(set)
     with engine.connect() as conn:
-        for table, columns in expected_columns.items():
-            print(f"\n[TABLE] {table}")
-
-            # Get table info
-            result = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
-            existing_columns = [row[1] for row in result]
-
-            for col in columns:
-                if col in existing_columns:
-                    print(f"  [OK] {col}")
-                else:
-                    print(f"  [MISSING] {col}")
-                    all_good = False
+        for table, column in conn.execute(columns_query, {'tables': list(expected_columns)}):
+            table_columns[table].add(column)
+
+    for table, columns in expected_columns.items():
+        print(f"\n[TABLE] {table}")
+
+        existing_columns = table_columns[table]
+
+        for col in columns:
+            if col in existing_columns:
+                print(f"  [OK] {col}")
+            else:
+                print(f"  [MISSING] {col}")
+                all_good = False
 
     print("\n" + "=" * 70)
     if all_good:
@@ -3,7 +3,10 @@
 Database Schema Verification Script
 Verifies that all tables, columns, indexes, and foreign keys match the specification
 """
+import argparse
 import sys
+from functools import lru_cache
+from typing import Iterator, NamedTuple
 sys.path.insert(0, '.')
 
 from sqlalchemy import create_engine, inspect
@@ -12,198 +15,255 @@ from app.models.base import Base
 # Import all models to ensure they're registered
 from app.models import *
 
-def verify_schema():
-    """Verify database schema against specification"""
+# Expected tables from 02_DATABASE_SCHEMA.md and 03_DATABASE_RELATIONSHIPS.md
+CORE_TABLES = (
+    'users', 'companies', 'company_roles', 'company_role_assignments',
+    'client_profiles', 'person_company_affiliations', 'internal_external_links',
+    'clients',
+    'technology_vendors', 'products', 'owners_developers',
+    'constructors', 'operators', 'projects', 'personnel', 'offtakers',
+    'contact_log', 'roundtable_history', 'confidential_field_flags',
+    'audit_log', 'database_snapshots', 'system_settings', 'schema_version'
+)
+JUNCTION_TABLES = (
+    'vendor_supplier_relationships', 'owner_vendor_relationships',
+    'project_vendor_relationships', 'project_constructor_relationships',
+    'project_operator_relationships', 'project_owner_relationships',
+    'project_offtaker_relationships', 'vendor_preferred_constructor',
+    'personnel_entity_relationships', 'entity_team_members',
+    'client_owner_relationships', 'client_project_relationships',
+    'client_vendor_relationships', 'client_operator_relationships',
+    'client_personnel_relationships'
+)
+EXPECTED_TABLES = frozenset(CORE_TABLES) | frozenset(JUNCTION_TABLES)
 
+# Columns each key table must carry (built once at import)
+REQUIRED_COLUMNS = {
+    'users': frozenset([
+        'user_id', 'username', 'email', 'password_hash',
+        'has_confidential_access', 'is_ned_team', 'is_admin'
+    ]),
+    'projects': frozenset(['project_id', 'project_name', 'capex', 'opex', 'fuel_cost', 'lcoe']),
+    'owners_developers': frozenset([
+        'owner_id', 'company_name', 'relationship_strength',
+        'client_priority', 'client_status', 'relationship_notes'
+    ]),
+}
+REQUIRED_COLUMNS_OK = {
+    'users': 'has all required columns',
+    'projects': 'has all required columns (including financial)',
+    'owners_developers': 'has all CRM fields',
+}
+
+# (table, column, referred table) foreign keys that must exist
+FK_CHECKS = (
+    ('products', 'vendor_id', 'technology_vendors'),
+    ('project_vendor_relationships', 'project_id', 'projects'),
+    ('project_vendor_relationships', 'vendor_id', 'technology_vendors'),
+    ('owner_vendor_relationships', 'owner_id', 'owners_developers'),
+    ('owner_vendor_relationships', 'vendor_id', 'technology_vendors'),
+    ('project_offtaker_relationships', 'project_id', 'projects'),
+    ('project_offtaker_relationships', 'offtaker_id', 'offtakers'),
+)
+
+
+@lru_cache(maxsize=1)
+def _build_inspector():
+    """
+    Build the schema in an in-memory database and reflect it once
+
+    Cached so repeated verify_schema() calls only redo the comparison.
+
+    Returns:
+        (tables_set, multi_cols, multi_indexes, multi_fks), with the
+        reflection dicts keyed by table name
+    """
     # Create in-memory database for testing
     engine = create_engine('sqlite:///:memory:', echo=False)
 
     # Create all tables
     Base.metadata.create_all(engine)
 
-    # Get inspector
+    # Get inspector and reflect every table's columns, indexes and foreign
+    # keys in one bulk call each
     inspector = inspect(engine)
+    multi_cols = {name: cols for (_, name), cols in inspector.get_multi_columns().items()}
+    multi_indexes = {name: idx for (_, name), idx in inspector.get_multi_indexes().items()}
+    multi_fks = {name: fks for (_, name), fks in inspector.get_multi_foreign_keys().items()}
+    tables_set = frozenset(inspector.get_table_names())
 
-    # Get all tables
-    tables = inspector.get_table_names()
-
-    # Expected tables from 02_DATABASE_SCHEMA.md and 03_DATABASE_RELATIONSHIPS.md
-    expected_tables = {
-        # Core Entity Tables (22)
-        'users',
-        'companies',
-        'company_roles',
-        'company_role_assignments',
-        'client_profiles',
-        'person_company_affiliations',
-        'internal_external_links',
-        'clients',
-        'technology_vendors',
-        'products',
-        'owners_developers',
-        'constructors',
-        'operators',
-        'projects',
-        'personnel',
-        'offtakers',
-        'contact_log',
-        'roundtable_history',
-        'confidential_field_flags',
-        'audit_log',
-        'database_snapshots',
-        'system_settings',
-        'schema_version',
-        # Junction Tables (15)
-        'vendor_supplier_relationships',
-        'owner_vendor_relationships',
-        'project_vendor_relationships',
-        'project_constructor_relationships',
-        'project_operator_relationships',
-        'project_owner_relationships',
-        'project_offtaker_relationships',
-        'vendor_preferred_constructor',
-        'personnel_entity_relationships',
-        'entity_team_members',
-        'client_owner_relationships',
-        'client_project_relationships',
-        'client_vendor_relationships',
-        'client_operator_relationships',
-        'client_personnel_relationships',
+    engine.dispose()
+    return tables_set, multi_cols, multi_indexes, multi_fks
+
+
+class Finding(NamedTuple):
+    """One way the built schema differs from the specification"""
+    kind: str  # 'missing_table', 'missing_columns' or 'missing_fk'
+    table: str
+    detail: str
+
+
+def _fk_index(multi_fks):
+    """(column, referred table) pairs per table, so each FK check is one lookup"""
+    return {
+        table: {(col, fk['referred_table']) for fk in fks for col in fk['constrained_columns']}
+        for table, fks in multi_fks.items()
     }
 
-    print("="*70)
-    print("DATABASE SCHEMA VERIFICATION")
-    print("="*70)
+
+def iter_findings(tables_set, multi_cols, multi_fks) -> Iterator[Finding]:
+    """
+    Lazily yield schema problems: missing tables, then missing key-table
+    columns, then missing foreign keys
+
+    Callers that only need pass/fail can stop at the first finding.
+    """
+    for table in CORE_TABLES + JUNCTION_TABLES:
+        if table not in tables_set:
+            yield Finding('missing_table', table, 'table not created')
+
+    for table, required_cols in REQUIRED_COLUMNS.items():
+        if table not in tables_set:
+            continue
+        missing_cols = required_cols - {col['name'] for col in multi_cols[table]}
+        if missing_cols:
+            yield Finding('missing_columns', table, ', '.join(sorted(missing_cols)))
+
+    fk_index = _fk_index(multi_fks)
+    for table, col, ref_table in FK_CHECKS:
+        if table in tables_set and (col, ref_table) not in fk_index[table]:
+            yield Finding('missing_fk', table, f"{col} -> {ref_table}")
+
+
+def verify_schema(fast=False):
+    """
+    Verify database schema against specification
+
+    Both modes judge the schema by iter_findings(), so they pass or fail
+    together.
+
+    Args:
+        fast: Skip the report and stop at the first finding (pass/fail only)
+
+    Returns:
+        True when there are no findings
+    """
+
+    tables_set, multi_cols, multi_indexes, multi_fks = _build_inspector()
+
+    if fast:
+        finding = next(iter_findings(tables_set, multi_cols, multi_fks), None)
+        if finding is None:
+            print("✓ Schema matches specification")
+            return True
+        print(f"✗ {finding.table}: {finding.kind.replace('_', ' ')} ({finding.detail})")
+        return False
+
+    findings = list(iter_findings(tables_set, multi_cols, multi_fks))
+    print(render_findings(findings, tables_set, multi_cols, multi_indexes, multi_fks))
+    return not findings
+
+
+def render_findings(findings, tables_set, multi_cols, multi_indexes, multi_fks):
+    """
+    Build the full verification report around a list of findings
+
+    Returns:
+        The report text
+    """
+
+    # Collected as lines and joined once; the caller prints it in one write
+    report = [
+        "=" * 70,
+        "DATABASE SCHEMA VERIFICATION",
+        "=" * 70,
+    ]
 
     # Check tables
-    print(f"\n✓ Created {len(tables)} tables (expected {len(expected_tables)})")
+    report.append(f"\n✓ Created {len(tables_set)} tables (expected {len(EXPECTED_TABLES)})")
 
-    missing_tables = expected_tables - set(tables)
+    missing_tables = {f.table for f in findings if f.kind == 'missing_table'}
     if missing_tables:
-        print(f"✗ MISSING TABLES: {missing_tables}")
-        return False
+        report.append(f"✗ MISSING TABLES: {missing_tables}")
+        return "\n".join(report)
 
-    extra_tables = set(tables) - expected_tables
+    extra_tables = tables_set - EXPECTED_TABLES
     if extra_tables:
-        print(f"⚠ Extra tables: {extra_tables}")
-
-    print("\nTABLE DETAILS:")
-    print("-"*70)
-
-    total_columns = 0
-    total_indexes = 0
-    total_fks = 0
-
-    for table in sorted(tables):
-        columns = inspector.get_columns(table)
-        indexes = inspector.get_indexes(table)
-        fks = inspector.get_foreign_keys(table)
-
-        total_columns += len(columns)
-        total_indexes += len(indexes)
-        total_fks += len(fks)
-
-        print(f"{table:40s} {len(columns):2d} cols, {len(indexes):2d} indexes, {len(fks):2d} FKs")
-
-    print("-"*70)
-    print(f"{'TOTALS':40s} {total_columns:2d} cols, {total_indexes:2d} indexes, {total_fks:2d} FKs")
-
-    print("\nCORE ENTITY TABLES (22):")
-    core_tables = [
-        'users', 'companies', 'company_roles', 'company_role_assignments',
-        'client_profiles', 'person_company_affiliations', 'internal_external_links',
-        'clients',
-        'technology_vendors', 'products', 'owners_developers',
-        'constructors', 'operators', 'projects', 'personnel', 'offtakers',
-        'contact_log', 'roundtable_history', 'confidential_field_flags',
-        'audit_log', 'database_snapshots', 'system_settings', 'schema_version'
-    ]
-    for table in core_tables:
-        status = "✓" if table in tables else "✗"
-        print(f"  {status} {table}")
-
-    print("\nJUNCTION TABLES (15):")
-    junction_tables = [
-        'vendor_supplier_relationships', 'owner_vendor_relationships',
-        'project_vendor_relationships', 'project_constructor_relationships',
-        'project_operator_relationships', 'project_owner_relationships',
-        'project_offtaker_relationships', 'vendor_preferred_constructor',
-        'personnel_entity_relationships', 'entity_team_members',
-        'client_owner_relationships', 'client_project_relationships',
-        'client_vendor_relationships', 'client_operator_relationships',
-        'client_personnel_relationships'
+        report.append(f"⚠ Extra tables: {set(extra_tables)}")
+
+    report.append("\nTABLE DETAILS:")
+    report.append("-" * 70)
+
+    stats = [
+        (table, len(multi_cols[table]), len(multi_indexes[table]), len(multi_fks[table]))
+        for table in sorted(tables_set)
     ]
-    for table in junction_tables:
-        status = "✓" if table in tables else "✗"
-        print(f"  {status} {table}")
+    total_columns = sum(n_cols for _, n_cols, _, _ in stats)
+    total_indexes = sum(n_idx for _, _, n_idx, _ in stats)
+    total_fks = sum(n_fk for _, _, _, n_fk in stats)
+
+    report.extend(
+        f"{table:40s} {n_cols:2d} cols, {n_idx:2d} indexes, {n_fk:2d} FKs"
+        for table, n_cols, n_idx, n_fk in stats
+    )
+    report.append("-" * 70)
+    report.append(f"{'TOTALS':40s} {total_columns:2d} cols, {total_indexes:2d} indexes, {total_fks:2d} FKs")
+
+    report.append("\nCORE ENTITY TABLES (22):")
+    report.extend(f"  {'✓' if table in tables_set else '✗'} {table}" for table in CORE_TABLES)
+
+    report.append("\nJUNCTION TABLES (15):")
+    report.extend(f"  {'✓' if table in tables_set else '✗'} {table}" for table in JUNCTION_TABLES)
 
     # Verify key tables have correct structure
-    print("\nKEY TABLE VERIFICATION:")
-
-    # Check Users table
-    user_cols = [col['name'] for col in inspector.get_columns('users')]
-    required_user_cols = ['user_id', 'username', 'email', 'password_hash',
-                         'has_confidential_access', 'is_ned_team', 'is_admin']
-    missing_user_cols = set(required_user_cols) - set(user_cols)
-    if missing_user_cols:
-        print(f"  ✗ users table missing columns: {missing_user_cols}")
-    else:
-        print(f"  ✓ users table has all required columns")
-
-    # Check Projects table
-    project_cols = [col['name'] for col in inspector.get_columns('projects')]
-    required_project_cols = ['project_id', 'project_name', 'capex', 'opex', 'fuel_cost', 'lcoe']
-    missing_project_cols = set(required_project_cols) - set(project_cols)
-    if missing_project_cols:
-        print(f"  ✗ projects table missing columns: {missing_project_cols}")
-    else:
-        print(f"  ✓ projects table has all required columns (including financial)")
-
-    # Check Owners_Developers table
-    owner_cols = [col['name'] for col in inspector.get_columns('owners_developers')]
-    required_owner_cols = ['owner_id', 'company_name', 'relationship_strength',
-                          'client_priority', 'client_status', 'relationship_notes']
-    missing_owner_cols = set(required_owner_cols) - set(owner_cols)
-    if missing_owner_cols:
-        print(f"  ✗ owners_developers table missing columns: {missing_owner_cols}")
-    else:
-        print(f"  ✓ owners_developers table has all CRM fields")
+    report.append("\nKEY TABLE VERIFICATION:")
 
-    # Check foreign keys
-    print("\nFOREIGN KEY VERIFICATION:")
-    fk_checks = [
-        ('products', 'vendor_id', 'technology_vendors'),
-        ('project_vendor_relationships', 'project_id', 'projects'),
-        ('project_vendor_relationships', 'vendor_id', 'technology_vendors'),
-        ('owner_vendor_relationships', 'owner_id', 'owners_developers'),
-        ('owner_vendor_relationships', 'vendor_id', 'technology_vendors'),
-        ('project_offtaker_relationships', 'project_id', 'projects'),
-        ('project_offtaker_relationships', 'offtaker_id', 'offtakers'),
-    ]
+    missing_columns = {f.table: f.detail for f in findings if f.kind == 'missing_columns'}
+    for table in REQUIRED_COLUMNS:
+        if table in missing_columns:
+            report.append(f"  ✗ {table} table missing columns: {missing_columns[table]}")
+        else:
+            report.append(f"  ✓ {table} table {REQUIRED_COLUMNS_OK[table]}")
 
-    for table, col, ref_table in fk_checks:
-        fks = inspector.get_foreign_keys(table)
-        fk_found = any(col in fk['constrained_columns'] and
-                      ref_table == fk['referred_table'] for fk in fks)
-        status = "✓" if fk_found else "✗"
-        print(f"  {status} {table}.{col} -> {ref_table}")
+    # Check foreign keys
+    report.append("\nFOREIGN KEY VERIFICATION:")
+    missing_fks = {(f.table, f.detail) for f in findings if f.kind == 'missing_fk'}
+    for table, col, ref_table in FK_CHECKS:
+        status = "✗" if (table, f"{col} -> {ref_table}") in missing_fks else "✓"
+        report.append(f"  {status} {table}.{col} -> {ref_table}")
 
-    print("\n" + "="*70)
-    print("✓ SCHEMA VERIFICATION COMPLETE")
-    print("="*70)
-    print(f"\n  All {len(expected_tables)} tables created successfully")
-    print(f"  Total: {total_columns} columns, {total_indexes} indexes, {total_fks} foreign keys")
-    print(f"\n  Schema matches specification docs:")
-    print(f"    - docs/02_DATABASE_SCHEMA.md")
-    print(f"    - docs/03_DATABASE_RELATIONSHIPS.md")
-    print("="*70)
+    report.append("\n" + "=" * 70)
+    if findings:
+        report.extend([
+            f"✗ SCHEMA VERIFICATION FAILED ({len(findings)} finding(s))",
+            "=" * 70,
+        ])
+        return "\n".join(report)
 
-    return True
+    report.extend([
+        "✓ SCHEMA VERIFICATION COMPLETE",
+        "=" * 70,
+        f"\n  All {len(EXPECTED_TABLES)} tables created successfully",
+        f"  Total: {total_columns} columns, {total_indexes} indexes, {total_fks} foreign keys",
+        "\n  Schema matches specification docs:",
+        "    - docs/02_DATABASE_SCHEMA.md",
+        "    - docs/03_DATABASE_RELATIONSHIPS.md",
+        "=" * 70,
+    ])
+    return "\n".join(report)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Only report pass/fail, stopping at the first missing table, column or FK",
+    )
+    args = parser.parse_args()
+
     try:
-        success = verify_schema()
+        success = verify_schema(fast=args.fast)
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\n✗ ERROR: {e}")
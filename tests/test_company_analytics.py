@@ -0,0 +1,66 @@
+"""
+Tests for company analytics queries against the unified company schema
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Company, CompanyRole, CompanyRoleAssignment
+from app.services import company_analytics
+
+
+@pytest.fixture
+def analytics_session(monkeypatch):
+    """In-memory database with two roles and a handful of assignments"""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    vendor = CompanyRole(role_code='vendor', role_label='Vendor')
+    operator = CompanyRole(role_code='operator', role_label='Operator')
+    client = CompanyRole(role_code='client', role_label='Client')
+    acme = Company(company_name='Acme Nuclear')
+    beta = Company(company_name='Beta Power')
+    session.add_all([vendor, operator, client, acme, beta])
+    session.flush()
+
+    session.add_all([
+        CompanyRoleAssignment(company_id=acme.company_id, role_id=vendor.role_id,
+                              context_type='Project', context_id=1),
+        CompanyRoleAssignment(company_id=acme.company_id, role_id=vendor.role_id,
+                              context_type='Project', context_id=2),
+        CompanyRoleAssignment(company_id=beta.company_id, role_id=operator.role_id,
+                              context_type='Project', context_id=1),
+        CompanyRoleAssignment(company_id=beta.company_id, role_id=vendor.role_id,
+                              context_type='Global', context_id=None),
+    ])
+    session.commit()
+
+    monkeypatch.setattr(company_analytics, 'db_session', session)
+    yield session
+    session.close()
+
+
+def test_project_participation_summary(analytics_session):
+    """Project assignment counts are grouped by role, including empty roles"""
+    summary = company_analytics.get_project_participation_summary()
+
+    assert summary['companies_with_projects'] == 2
+    assert summary['role_assignments'] == {'vendor': 2, 'operator': 1, 'client': 0}
+
+
+def test_company_counts_by_role(analytics_session):
+    """Distinct companies per role, with zero for unassigned roles"""
+    counts = company_analytics.get_company_counts_by_role()
+
+    assert counts == {'vendor': 2, 'operator': 1, 'client': 0}
+
+
+def test_companies_by_role(analytics_session):
+    """Companies holding a role are returned once each, sorted by name"""
+    vendors = company_analytics.get_companies_by_role('vendor')
+
+    assert [c.company_name for c in vendors] == ['Acme Nuclear', 'Beta Power']
+    assert company_analytics.get_companies_by_role('client') == []
+    assert company_analytics.get_companies_by_role('missing') == []
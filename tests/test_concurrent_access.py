@@ -14,6 +14,22 @@ import time
 import os
 from datetime import datetime
 
+BUSY_TIMEOUT_MS = 30000
+
+
+def _connect(db_path):
+    """Open the database with the same lock handling for both roles
+
+    busy_timeout is set before journal_mode so the mode switch itself waits
+    in SQLite's C busy handler rather than failing with SQLITE_BUSY.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
+    return conn
+
+
 def write_test_marker(db_path):
     """Write a test marker to the database"""
     print(f"\n{'='*70}")
@@ -28,8 +44,7 @@ def write_test_marker(db_path):
         print(f"File size: {stat.st_size:,} bytes")
         print(f"Last modified: {datetime.fromtimestamp(stat.st_mtime)}")
     
-    conn = sqlite3.connect(db_path, timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL")
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Check if system_settings table exists
@@ -89,8 +104,7 @@ def read_test_marker(db_path):
         print("ERROR: Database file does not exist!")
         return
     
-    conn = sqlite3.connect(db_path, timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL")
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Read test marker
@@ -1,21 +1,17 @@
-from app import create_app
+"""Exercise the /select-db/db-info debug endpoint with a selected database.
 
-# This script uses Flask's test client to simulate a browser session
-# which has already selected the Q: database via session. It then
-# calls the temporary debug endpoint /select-db/db-info and prints the
-# JSON response. Save this file at the repo root and run:
-#    (.venv) C:\...\NukeWorks> python test_dbinfo.py
+Uses Flask's test client to simulate a browser session which has already
+selected the suite database via the session.
+"""
+import json
 
-app = create_app('development')
-app.testing = True
-
-path = r"Q:\0001\PS05DNED\Uncontrolled Documents\5 - Reference Info\Projects Database\nukeworks.sqlite"
-
-with app.test_client() as client:
-    # Set the session to indicate the DB was selected in the browser
-    with client.session_transaction() as sess:
-        sess['selected_db_path'] = path
 
+def test_db_info(client, _database_path):
+    """The endpoint reports metadata for the session-selected database"""
     resp = client.get('/select-db/db-info')
-    print('status:', resp.status_code)
-    print(resp.get_data(as_text=True))
+    assert resp.status_code == 200
+
+    info = json.loads(resp.get_data(as_text=True))
+    assert info['selected_db_path'] == str(_database_path)
+    assert info['exists'] is True
+    assert 'users' in info['tables']
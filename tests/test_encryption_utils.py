@@ -4,8 +4,10 @@ Tests for encryption utilities and key management
 
 import pytest
 import os
+from collections import namedtuple
 from app.utils.encryption import (
     encrypt_value,
+    encrypt_bytes,
     decrypt_value,
     decrypt_for_user,
     encrypt_confidential,
@@ -43,6 +45,11 @@ def test_key_manager_get_cipher():
     decrypted = cipher.decrypt(encrypted)
     assert decrypted == test_data
 
+    # The cipher is built once per key type and rebuilt after a key reload
+    assert KeyManager.get_cipher('confidential') is cipher
+    KeyManager.reload_keys()
+    assert KeyManager.get_cipher('confidential') is not cipher
+
 
 def test_key_validation():
     """Test that key validation works"""
@@ -67,6 +74,20 @@ def test_missing_keys_fail_loudly(monkeypatch):
     KeyManager.reload_keys()
 
 
+def test_test_cache_reuses_ciphertext():
+    """Test that the opt-in test cache returns one token per plaintext"""
+    KeyManager.enable_test_cache()
+    try:
+        first = encrypt_value("$5,000,000", 'confidential')
+        assert encrypt_value("$5,000,000", 'confidential') == first
+        assert encrypt_value("$5,000,000", 'ned_team') != first
+        assert decrypt_value(first, 'confidential') == "$5,000,000"
+    finally:
+        KeyManager.disable_test_cache()
+
+    assert encrypt_value("$5,000,000", 'confidential') != first
+
+
 def test_invalid_key_type():
     """Test that invalid key type raises error"""
     with pytest.raises(EncryptionKeyError):
@@ -77,12 +98,11 @@ def test_invalid_key_type():
 # TEST ENCRYPTION/DECRYPTION
 # =============================================================================
 
-def test_encrypt_decrypt_confidential():
+def test_encrypt_decrypt_confidential(encrypted_money):
     """Test encrypting and decrypting confidential data"""
-    original_value = "$5,000,000"
+    original_value, encrypted = encrypted_money
 
     # Encrypt
-    encrypted = encrypt_confidential(original_value)
     assert encrypted is not None
     assert isinstance(encrypted, bytes)
     assert encrypted != original_value.encode()  # Should be different
@@ -92,20 +112,17 @@ def test_encrypt_decrypt_confidential():
     assert decrypted == original_value
 
 
-def test_encrypt_decrypt_various_types():
+@pytest.mark.parametrize("value", [
+    "$5,000,000",
+    "500000",
+    "0.085",
+    "This is a long note with special characters: !@#$%^&*()",
+    "",  # Empty string
+])
+def test_encrypt_decrypt_various_types(value):
     """Test encryption works with various data types"""
-    test_values = [
-        "$5,000,000",
-        "500000",
-        "0.085",
-        "This is a long note with special characters: !@#$%^&*()",
-        "",  # Empty string
-    ]
-
-    for value in test_values:
-        encrypted = encrypt_value(value, 'confidential')
-        decrypted = decrypt_value(encrypted, 'confidential')
-        assert decrypted == str(value), f"Failed for value: {value}"
+    encrypted = encrypt_value(value, 'confidential')
+    assert decrypt_value(encrypted, 'confidential') == str(value)
 
 
 def test_encrypt_none():
@@ -117,6 +134,13 @@ def test_encrypt_none():
     assert decrypted is None
 
 
+def test_encrypt_bytes_matches_encrypt_value():
+    """Test that pre-encoded plaintext round-trips like encrypt_value"""
+    encrypted = encrypt_bytes("$5,000,000".encode('utf-8'), 'confidential')
+    assert decrypt_value(encrypted, 'confidential') == "$5,000,000"
+    assert encrypt_bytes(None, 'confidential') is None
+
+
 def test_decrypt_invalid_data():
     """Test that decrypting invalid data raises error"""
     invalid_data = b"this is not encrypted data"
@@ -129,49 +153,32 @@ def test_decrypt_invalid_data():
 # TEST PERMISSION-BASED ACCESS
 # =============================================================================
 
-class MockUser:
-    """Mock user for testing"""
-    def __init__(self, has_confidential_access=False, is_ned_team=False, is_admin=False):
-        self.is_authenticated = True
-        self.has_confidential_access = has_confidential_access
-        self.is_ned_team = is_ned_team
-        self.is_admin = is_admin
-
-
-def test_user_can_access_confidential_key():
-    """Test that users with confidential access can access confidential key"""
-    # User with confidential access
-    user = MockUser(has_confidential_access=True)
-    assert KeyManager.user_can_access_key(user, 'confidential') is True
-
-    # User without confidential access
-    user = MockUser(has_confidential_access=False)
-    assert KeyManager.user_can_access_key(user, 'confidential') is False
-
-    # Admin always has access
-    user = MockUser(is_admin=True)
-    assert KeyManager.user_can_access_key(user, 'confidential') is True
-
-
-def test_user_can_access_ned_team_key():
-    """Test that NED team members can access NED team key"""
-    # NED team member
-    user = MockUser(is_ned_team=True)
-    assert KeyManager.user_can_access_key(user, 'ned_team') is True
+# Mock user for testing (keyword defaults: a logged-in user with no flags)
+MockUser = namedtuple(
+    'MockUser',
+    'has_confidential_access is_ned_team is_admin is_authenticated',
+    defaults=(False, False, False, True),
+)
 
-    # Non-NED team member
-    user = MockUser(is_ned_team=False)
-    assert KeyManager.user_can_access_key(user, 'ned_team') is False
 
-    # Admin always has access
-    user = MockUser(is_admin=True)
-    assert KeyManager.user_can_access_key(user, 'ned_team') is True
+@pytest.mark.parametrize("user, key_type, expected", [
+    # Confidential key: confidential access or admin
+    (MockUser(has_confidential_access=True), 'confidential', True),
+    (MockUser(has_confidential_access=False), 'confidential', False),
+    (MockUser(is_admin=True), 'confidential', True),
+    # NED team key: NED team membership or admin
+    (MockUser(is_ned_team=True), 'ned_team', True),
+    (MockUser(is_ned_team=False), 'ned_team', False),
+    (MockUser(is_admin=True), 'ned_team', True),
+])
+def test_user_can_access_key(user, key_type, expected):
+    """Test which users can access the confidential and NED team keys"""
+    assert KeyManager.user_can_access_key(user, key_type) is expected
 
 
-def test_decrypt_for_user_with_permission():
+def test_decrypt_for_user_with_permission(encrypted_money):
     """Test that users with permission can decrypt data"""
-    original_value = "$5,000,000"
-    encrypted = encrypt_confidential(original_value)
+    original_value, encrypted = encrypted_money
 
     # User with confidential access
     user = MockUser(has_confidential_access=True)
@@ -179,10 +186,9 @@ def test_decrypt_for_user_with_permission():
     assert decrypted == original_value
 
 
-def test_decrypt_for_user_without_permission():
+def test_decrypt_for_user_without_permission(encrypted_money):
     """Test that users without permission see redaction message"""
-    original_value = "$5,000,000"
-    encrypted = encrypt_confidential(original_value)
+    _, encrypted = encrypted_money
 
     # User without confidential access
     user = MockUser(has_confidential_access=False)
@@ -205,38 +211,40 @@ def test_decrypt_for_user_custom_redaction():
     assert decrypted == "[NED Team Only]"
 
 
-def test_get_user_key_access():
+@pytest.mark.parametrize("user, confidential, ned_team", [
+    (MockUser(), False, False),                               # Standard user
+    (MockUser(has_confidential_access=True), True, False),    # Confidential user
+    (MockUser(is_ned_team=True), False, True),                # NED team user
+    (MockUser(is_admin=True), True, True),                    # Admin
+])
+def test_get_user_key_access(user, confidential, ned_team):
     """Test getting summary of user's key access"""
-    # Standard user
-    user = MockUser()
-    access = PermissionBasedEncryption.get_user_key_access(user)
-    assert access['confidential'] is False
-    assert access['ned_team'] is False
-
-    # Confidential user
-    user = MockUser(has_confidential_access=True)
-    access = PermissionBasedEncryption.get_user_key_access(user)
-    assert access['confidential'] is True
-    assert access['ned_team'] is False
-
-    # NED team user
-    user = MockUser(is_ned_team=True)
-    access = PermissionBasedEncryption.get_user_key_access(user)
-    assert access['confidential'] is False
-    assert access['ned_team'] is True
-
-    # Admin
-    user = MockUser(is_admin=True)
     access = PermissionBasedEncryption.get_user_key_access(user)
-    assert access['confidential'] is True
-    assert access['ned_team'] is True
+    assert access['confidential'] is confidential
+    assert access['ned_team'] is ned_team
 
 
 # =============================================================================
 # TEST USER SCENARIOS
 # =============================================================================
 
-def test_joe_scenario():
+# Scenario fixtures hold real Fernet tokens from the production helpers so
+# decrypt_for_user() is exercised end to end; each is encrypted once per module
+@pytest.fixture(scope='module')
+def encrypted_opex():
+    """(plaintext, ciphertext) for a confidential opex amount, encrypted once per module"""
+    plaintext = "$500,000"
+    return plaintext, encrypt_confidential(plaintext)
+
+
+@pytest.fixture(scope='module')
+def encrypted_ned_notes():
+    """(plaintext, ciphertext) for NED team notes, encrypted once per module"""
+    plaintext = "Confidential relationship notes"
+    return plaintext, encrypt_value(plaintext, 'ned_team')
+
+
+def test_joe_scenario(encrypted_money, encrypted_opex, encrypted_ned_notes):
     """
     Test Joe's experience (standard user, no confidential access)
     He should see redacted messages for all encrypted confidential data
@@ -244,21 +252,21 @@ def test_joe_scenario():
     joe = MockUser(has_confidential_access=False, is_ned_team=False)
 
     # Joe tries to view confidential financial data
-    capex_encrypted = encrypt_confidential("$5,000,000")
+    _, capex_encrypted = encrypted_money
     capex_view = decrypt_for_user(capex_encrypted, 'confidential', joe)
     assert capex_view == "[Confidential]"
 
-    opex_encrypted = encrypt_confidential("$500,000")
+    _, opex_encrypted = encrypted_opex
     opex_view = decrypt_for_user(opex_encrypted, 'confidential', joe)
     assert opex_view == "[Confidential]"
 
     # Joe also can't see NED team notes
-    notes_encrypted = encrypt_value("Confidential relationship notes", 'ned_team')
+    _, notes_encrypted = encrypted_ned_notes
     notes_view = decrypt_for_user(notes_encrypted, 'ned_team', joe)
     assert notes_view == "[Confidential]"
 
 
-def test_sally_scenario():
+def test_sally_scenario(encrypted_money, encrypted_opex, encrypted_ned_notes):
     """
     Test Sally's experience (confidential access but not NED team)
     She should see confidential financial data but not NED team notes
@@ -266,21 +274,21 @@ def test_sally_scenario():
     sally = MockUser(has_confidential_access=True, is_ned_team=False)
 
     # Sally can view confidential financial data
-    capex_encrypted = encrypt_confidential("$5,000,000")
+    _, capex_encrypted = encrypted_money
     capex_view = decrypt_for_user(capex_encrypted, 'confidential', sally)
     assert capex_view == "$5,000,000"
 
-    opex_encrypted = encrypt_confidential("$500,000")
+    opex_original, opex_encrypted = encrypted_opex
     opex_view = decrypt_for_user(opex_encrypted, 'confidential', sally)
-    assert opex_view == "$500,000"
+    assert opex_view == opex_original
 
     # Sally cannot see NED team notes
-    notes_encrypted = encrypt_value("Confidential relationship notes", 'ned_team')
+    _, notes_encrypted = encrypted_ned_notes
     notes_view = decrypt_for_user(notes_encrypted, 'ned_team', sally)
     assert notes_view == "[Confidential]"
 
 
-def test_admin_scenario():
+def test_admin_scenario(encrypted_money, encrypted_ned_notes):
     """
     Test Admin's experience
     They should see everything
@@ -288,28 +296,27 @@ def test_admin_scenario():
     admin = MockUser(is_admin=True)
 
     # Admin can view confidential financial data
-    capex_encrypted = encrypt_confidential("$5,000,000")
+    _, capex_encrypted = encrypted_money
     capex_view = decrypt_for_user(capex_encrypted, 'confidential', admin)
     assert capex_view == "$5,000,000"
 
     # Admin can also see NED team notes
-    notes_encrypted = encrypt_value("Confidential relationship notes", 'ned_team')
+    notes_original, notes_encrypted = encrypted_ned_notes
     notes_view = decrypt_for_user(notes_encrypted, 'ned_team', admin)
-    assert notes_view == "Confidential relationship notes"
+    assert notes_view == notes_original
 
 
 # =============================================================================
 # TEST DATABASE BROWSER SCENARIO
 # =============================================================================
 
-def test_database_browser_sees_encrypted_data():
+def test_database_browser_sees_encrypted_data(encrypted_money):
     """
     Simulate what happens when someone opens the database with DB Browser
     Even with the database file, they should only see encrypted gibberish
     """
     # Encrypt confidential data
-    capex_original = "$5,000,000"
-    capex_encrypted = encrypt_confidential(capex_original)
+    capex_original, capex_encrypted = encrypted_money
 
     # This is what's stored in the database (what DB Browser sees)
     database_stored_value = capex_encrypted
@@ -323,9 +330,34 @@ def test_database_browser_sees_encrypted_data():
 
     # Even if Joe opens DB Browser, he sees this gibberish
     # He can't decrypt it without the CONFIDENTIAL_DATA_KEY from .env
-    print(f"\nWhat DB Browser shows: {database_stored_value[:50]}...")
-    print(f"Length: {len(database_stored_value)} bytes")
 
     # Only someone with the key can decrypt
     decrypted = decrypt_confidential(database_stored_value)
     assert decrypted == capex_original
+
+
+# =============================================================================
+# TEST BULK INSERT
+# =============================================================================
+
+def test_bulk_insert_encrypted_projects():
+    """Bulk-inserted projects store ciphertext that decrypts to the input"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models import Base, Project
+
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    inserted = Project.bulk_insert_encrypted(session, [
+        {'project_name': 'Bulk Plant A', 'capex': '5000000', 'lcoe': None},
+        {'project_name': 'Bulk Plant B', 'capex': 7500000, 'lcoe': '0.085'},
+    ])
+    assert inserted == 2
+
+    rows = session.query(Project).order_by(Project.project_name).all()
+    assert [decrypt_confidential(p._capex_encrypted) for p in rows] == ['5000000', '7500000']
+    assert rows[0]._lcoe_encrypted is None
+    assert decrypt_confidential(rows[1]._lcoe_encrypted) == '0.085'
+    session.close()
@@ -1,50 +1,13 @@
-#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Test script to verify login functionality"""
-import sys
-import os
+from app.models import User
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Set test environment
-os.environ['FLASK_ENV'] = 'development'
-
-def test_login():
+def test_login(db_session, admin_user):
     """Test that we can query the User model without errors"""
-    try:
-        from app import create_app
-        from app.models import User
-
-        # Create app context
-        app = create_app()
-
-        with app.app_context():
-            # Get db_session from app
-            from app import db_session
-
-            # Try to query a user (this will trigger model initialization)
-            user = db_session.query(User).filter_by(username='admin').first()
-
-            if user:
-                print("[OK] Successfully queried User model")
-                print(f"[OK] Found user: {user.username}")
-                print(f"[OK] User ID: {user.user_id}")
-                print(f"[OK] User is admin: {user.is_admin}")
-                print(f"\n[OK] All models initialized successfully!")
-                return True
-            else:
-                print("[WARN] User 'admin' not found in database")
-                print("       (This might be expected if the database is new)")
-                return False
-
-    except Exception as e:
-        print(f"[ERROR] Error during login test: {type(e).__name__}")
-        print(f"        {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Querying a user triggers model initialization
+    user = db_session.query(User).filter_by(username='admin').first()
 
-if __name__ == '__main__':
-    success = test_login()
-    sys.exit(0 if success else 1)
+    assert user is not None, "User 'admin' not found in database"
+    assert user.user_id == admin_user.user_id
+    assert user.is_admin
@@ -4,23 +4,21 @@ Permission System Test Suite
 Tests both Tier 1 (Business Confidentiality) and Tier 2 (NED Team Access)
 """
 import sys
-import os
+from typing import NamedTuple
 
-# Add app directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from flask import current_app
+from flask_login import login_user
+from sqlalchemy import delete, func, select
 
 from app import create_app
-from app.models import User, Project, TechnologyVendor, ProjectVendorRelationship, ConfidentialFieldFlag
-
-# Global db_session reference
-db_session = None
+from app.models import AuditLog, User, Project, Company, CompanyRole, CompanyRoleAssignment, ConfidentialFieldFlag
 from app.utils.permissions import (
     # Tier 1 - Business Confidentiality
     can_view_field,
+    can_view_fields_bulk,
     get_field_display_value,
     can_view_relationship,
     filter_relationships,
-    mark_field_confidential,
     mark_financial_fields_confidential,
     # Tier 2 - NED Team Access
     can_view_ned_content,
@@ -33,42 +31,72 @@ from app.utils.permissions import (
     apply_confidential_filter
 )
 
+# Global db_session reference
+db_session = None
+
+# Users created by setup_test_users (cleanup matches these exact names)
+TEST_USERNAMES = ['test_admin', 'test_ned', 'test_conf', 'test_standard']
+
+
+# Report lines are buffered and written with one call (see _flush_output)
+_OUT = []
+
+
+def _emit(line=""):
+    """Queue one line of report output"""
+    _OUT.append(line)
+
+
+def _flush_output():
+    """Write all queued report lines at once"""
+    if _OUT:
+        sys.stdout.write("\n".join(_OUT) + "\n")
+        sys.stdout.flush()
+        _OUT.clear()
+
 
 def print_test_header(test_name):
     """Print formatted test header"""
-    print("\n" + "=" * 70)
-    print(f"TEST: {test_name}")
-    print("=" * 70)
+    _emit("\n" + "=" * 70)
+    _emit(f"TEST: {test_name}")
+    _emit("=" * 70)
 
 
 def print_test_result(description, result, expected=None):
     """Print formatted test result"""
     status = "✓ PASS" if result else "✗ FAIL"
-    print(f"{status}: {description}")
+    _emit(f"{status}: {description}")
     if expected is not None:
-        print(f"       Result: {result}, Expected: {expected}")
+        _emit(f"       Result: {result}, Expected: {expected}")
+    if not result:
+        # Show the report so far alongside the failure
+        _flush_output()
+    assert result, description
 
 
 def cleanup_test_data_full():
     """Clean up all test data including dependencies"""
-    # Delete test relationships first (they reference other tables)
-    db_session.query(ProjectVendorRelationship).filter(
-        ProjectVendorRelationship.notes.in_(['Public technology provider relationship', 'Confidential partnership relationship'])
-    ).delete(synchronize_session=False)
-
-    # Delete test projects
-    db_session.query(Project).filter(Project.project_name == 'Test Nuclear Project').delete(synchronize_session=False)
-
-    # Delete test vendors
-    db_session.query(TechnologyVendor).filter(
-        TechnologyVendor.vendor_name.in_(['Test Reactor Vendor', 'Test Reactor Vendor 2'])
-    ).delete(synchronize_session=False)
-
-    # Delete test confidential field flags
-    db_session.query(ConfidentialFieldFlag).filter(ConfidentialFieldFlag.table_name == 'projects').delete(synchronize_session=False)
-
-    # Finally delete test users
-    db_session.query(User).filter(User.username.like('test_%')).delete(synchronize_session=False)
+    # Dependents first (relationships reference the other tables). All of
+    # the deletes run in one transaction and are committed once.
+    statements = [
+        delete(CompanyRoleAssignment).where(
+            CompanyRoleAssignment.notes.in_(['Public technology provider relationship', 'Confidential partnership relationship'])
+        ),
+        delete(Project).where(Project.project_name == 'Test Nuclear Project'),
+        delete(Company).where(
+            Company.company_name.in_(['Test Reactor Vendor', 'Test Reactor Vendor 2'])
+        ),
+        delete(ConfidentialFieldFlag).where(ConfidentialFieldFlag.table_name == 'projects'),
+        # Audit rows written while a test user was logged in reference it
+        delete(AuditLog).where(
+            AuditLog.user_id.in_(select(User.user_id).where(User.username.in_(TEST_USERNAMES)))
+        ),
+        delete(User).where(User.username.in_(TEST_USERNAMES)),
+    ]
+
+    with db_session.no_autoflush:
+        for statement in statements:
+            db_session.execute(statement)
 
     db_session.commit()
 
@@ -131,10 +159,16 @@ def setup_test_users():
     db_session.add_all([admin, ned_user, conf_user, standard_user])
     db_session.commit()
 
-    print(f"✓ Created admin user (ID: {admin.user_id})")
-    print(f"✓ Created NED Team user (ID: {ned_user.user_id})")
-    print(f"✓ Created confidential access user (ID: {conf_user.user_id})")
-    print(f"✓ Created standard user (ID: {standard_user.user_id})")
+    # commit() expires all four users; reload them in one SELECT rather than
+    # one refresh per user on first attribute access
+    db_session.query(User).filter(
+        User.username.in_(TEST_USERNAMES)
+    ).all()
+
+    _emit(f"✓ Created admin user (ID: {admin.user_id})")
+    _emit(f"✓ Created NED Team user (ID: {ned_user.user_id})")
+    _emit(f"✓ Created confidential access user (ID: {conf_user.user_id})")
+    _emit(f"✓ Created standard user (ID: {standard_user.user_id})")
 
     return admin, ned_user, conf_user, standard_user
 
@@ -143,6 +177,11 @@ def setup_test_data(admin):
     """Create test project and vendor data"""
     print_test_header("Setting Up Test Data")
 
+    # Vendor role from the company role catalog (seeded by migrations)
+    vendor_role = db_session.query(CompanyRole).filter_by(role_code='vendor').first()
+    if vendor_role is None:
+        vendor_role = CompanyRole(role_code='vendor', role_label='Vendor')
+
     # Create test project
     project = Project(
         project_name='Test Nuclear Project',
@@ -153,25 +192,34 @@ def setup_test_data(admin):
         created_by=admin.user_id,
         modified_by=admin.user_id
     )
-    db_session.add(project)
-    db_session.commit()
-    print(f"✓ Created test project (ID: {project.project_id})")
 
-    # Create test vendor
-    vendor = TechnologyVendor(
-        vendor_name='Test Reactor Vendor',
+    # Create test vendors (a second vendor carries the confidential relationship)
+    vendor = Company(
+        company_name='Test Reactor Vendor',
         notes='Test vendor for permission testing',
         created_by=admin.user_id,
         modified_by=admin.user_id
     )
-    db_session.add(vendor)
-    db_session.commit()
-    print(f"✓ Created test vendor (ID: {vendor.vendor_id})")
+    vendor2 = Company(
+        company_name='Test Reactor Vendor 2',
+        notes='Second test vendor for confidential relationship',
+        created_by=admin.user_id,
+        modified_by=admin.user_id
+    )
+
+    # Flush (not commit) for the ids the relationships need; everything is
+    # committed together below in one transaction
+    db_session.add_all([vendor_role, project, vendor, vendor2])
+    db_session.flush()
+    _emit(f"✓ Created test project (ID: {project.project_id})")
+    _emit(f"✓ Created test vendor (ID: {vendor.company_id})")
 
     # Create public relationship
-    public_rel = ProjectVendorRelationship(
-        project_id=project.project_id,
-        vendor_id=vendor.vendor_id,
+    public_rel = CompanyRoleAssignment(
+        company_id=vendor.company_id,
+        role_id=vendor_role.role_id,
+        context_type='Project',
+        context_id=project.project_id,
         is_confidential=False,
         notes='Public technology provider relationship',
         created_by=admin.user_id,
@@ -179,19 +227,11 @@ def setup_test_data(admin):
     )
 
     # Create confidential relationship
-    # Need different vendor for unique constraint
-    vendor2 = TechnologyVendor(
-        vendor_name='Test Reactor Vendor 2',
-        notes='Second test vendor for confidential relationship',
-        created_by=admin.user_id,
-        modified_by=admin.user_id
-    )
-    db_session.add(vendor2)
-    db_session.commit()
-
-    conf_rel = ProjectVendorRelationship(
-        project_id=project.project_id,
-        vendor_id=vendor2.vendor_id,
+    conf_rel = CompanyRoleAssignment(
+        company_id=vendor2.company_id,
+        role_id=vendor_role.role_id,
+        context_type='Project',
+        context_id=project.project_id,
         is_confidential=True,
         notes='Confidential partnership relationship',
         created_by=admin.user_id,
@@ -200,8 +240,16 @@ def setup_test_data(admin):
 
     db_session.add_all([public_rel, conf_rel])
     db_session.commit()
-    print(f"✓ Created public relationship (ID: {public_rel.relationship_id})")
-    print(f"✓ Created confidential relationship (ID: {conf_rel.relationship_id})")
+
+    # Reload the expired project and relationships up front (two SELECTs)
+    # instead of lazily refreshing each object inside the tests
+    db_session.query(Project).filter(Project.project_name == 'Test Nuclear Project').all()
+    db_session.query(CompanyRoleAssignment).filter(
+        CompanyRoleAssignment.notes.in_(['Public technology provider relationship', 'Confidential partnership relationship'])
+    ).all()
+
+    _emit(f"✓ Created public relationship (ID: {public_rel.assignment_id})")
+    _emit(f"✓ Created confidential relationship (ID: {conf_rel.assignment_id})")
 
     return project, vendor, public_rel, conf_rel
 
@@ -210,28 +258,41 @@ def test_tier1_field_permissions(project, admin, conf_user, standard_user):
     """Test Tier 1: Field-level confidentiality"""
     print_test_header("Tier 1: Field-Level Permissions")
 
-    # Test 1: Mark financial field as confidential
-    flag = mark_field_confidential('projects', project.project_id, 'capex', True, admin.user_id)
+    # Test 1: Mark all financial fields confidential in one write (covers capex)
+    flags = mark_financial_fields_confidential(project.project_id, True, admin.user_id)
+    flags_by_field = {flag.field_name: flag for flag in flags}
     print_test_result(
         "Mark capex field as confidential",
-        flag is not None and flag.is_confidential
+        flags_by_field['capex'].is_confidential
+    )
+    print_test_result(
+        "Bulk mark all financial fields (capex, opex, fuel_cost, lcoe)",
+        len(flags) == 4 and all(flag.is_confidential for flag in flags)
     )
 
+    # Tests 2-5: one flag query per user covers every field checked
+    fields = ['capex', 'opex', 'fuel_cost', 'lcoe', 'project_name']
+    admin_view = can_view_fields_bulk(admin, 'projects', project.project_id, fields)
+    conf_view = can_view_fields_bulk(conf_user, 'projects', project.project_id, fields)
+    standard_view = can_view_fields_bulk(standard_user, 'projects', project.project_id, fields)
+
     # Test 2: Admin can view confidential field
-    result = can_view_field(admin, 'projects', project.project_id, 'capex')
-    print_test_result("Admin can view confidential field", result, True)
+    print_test_result("Admin can view confidential field", admin_view['capex'], True)
 
     # Test 3: Confidential user can view confidential field
-    result = can_view_field(conf_user, 'projects', project.project_id, 'capex')
-    print_test_result("Confidential user can view confidential field", result, True)
+    print_test_result("Confidential user can view confidential field", conf_view['capex'], True)
 
     # Test 4: Standard user cannot view confidential field
-    result = can_view_field(standard_user, 'projects', project.project_id, 'capex')
-    print_test_result("Standard user CANNOT view confidential field", not result, True)
+    print_test_result("Standard user CANNOT view confidential field", not standard_view['capex'], True)
 
     # Test 5: Standard user can view non-confidential field
-    result = can_view_field(standard_user, 'projects', project.project_id, 'project_name')
-    print_test_result("Standard user can view public field", result, True)
+    print_test_result("Standard user can view public field", standard_view['project_name'], True)
+
+    # Bulk check agrees with the single-field check
+    print_test_result(
+        "Bulk field check matches can_view_field",
+        standard_view['capex'] == can_view_field(standard_user, 'projects', project.project_id, 'capex')
+    )
 
     # Test 6: Get field display value with redaction
     value = get_field_display_value(standard_user, project, 'capex', 'projects')
@@ -240,18 +301,14 @@ def test_tier1_field_permissions(project, admin, conf_user, standard_user):
         value == "[Confidential]"
     )
 
-    # Test 7: Confidential user gets actual value
-    value = get_field_display_value(conf_user, project, 'capex', 'projects')
+    # Test 7: Confidential user gets actual value (EncryptedField decrypts
+    # for the logged-in user, so this needs a request with conf_user)
+    with current_app.test_request_context():
+        login_user(conf_user)
+        value = get_field_display_value(conf_user, project, 'capex', 'projects')
     print_test_result(
         "Confidential user gets actual value",
-        value == 5000000.00
-    )
-
-    # Test 8: Bulk mark all financial fields
-    flags = mark_financial_fields_confidential(project.project_id, True, admin.user_id)
-    print_test_result(
-        "Bulk mark all financial fields (capex, opex, fuel_cost, lcoe)",
-        len(flags) == 4
+        value not in (None, "[Confidential]") and float(value) == 5000000.00
     )
 
 
@@ -259,60 +316,66 @@ def test_tier1_relationship_permissions(public_rel, conf_rel, admin, conf_user,
     """Test Tier 1: Relationship-level confidentiality"""
     print_test_header("Tier 1: Relationship-Level Permissions")
 
+    # One filter_relationships call per user covers every relationship checked
+    all_rels = [public_rel, conf_rel]
+    admin_visible = {rel.assignment_id for rel in filter_relationships(admin, all_rels)}
+    conf_visible = {rel.assignment_id for rel in filter_relationships(conf_user, all_rels)}
+    standard_visible = {rel.assignment_id for rel in filter_relationships(standard_user, all_rels)}
+
     # Test 1: Admin can view confidential relationship
-    result = can_view_relationship(admin, conf_rel)
-    print_test_result("Admin can view confidential relationship", result, True)
+    print_test_result("Admin can view confidential relationship", conf_rel.assignment_id in admin_visible, True)
 
     # Test 2: Confidential user can view confidential relationship
-    result = can_view_relationship(conf_user, conf_rel)
-    print_test_result("Confidential user can view confidential relationship", result, True)
+    print_test_result(
+        "Confidential user can view confidential relationship",
+        conf_rel.assignment_id in conf_visible, True
+    )
 
     # Test 3: Standard user cannot view confidential relationship
-    result = can_view_relationship(standard_user, conf_rel)
-    print_test_result("Standard user CANNOT view confidential relationship", not result, True)
+    print_test_result(
+        "Standard user CANNOT view confidential relationship",
+        conf_rel.assignment_id not in standard_visible, True
+    )
 
     # Test 4: All users can view public relationship
-    result = can_view_relationship(standard_user, public_rel)
-    print_test_result("Standard user can view public relationship", result, True)
+    print_test_result("Standard user can view public relationship", public_rel.assignment_id in standard_visible, True)
+
+    # Bulk filter agrees with the single-relationship check
+    print_test_result(
+        "filter_relationships matches can_view_relationship",
+        (conf_rel.assignment_id in standard_visible) == can_view_relationship(standard_user, conf_rel)
+    )
 
     # Test 5: Filter relationships for standard user
-    all_rels = [public_rel, conf_rel]
-    filtered = filter_relationships(standard_user, all_rels)
     print_test_result(
         "Filter relationships - standard user sees only public",
-        len(filtered) == 1 and filtered[0].relationship_id == public_rel.relationship_id
+        standard_visible == {public_rel.assignment_id}
     )
 
     # Test 6: Filter relationships for confidential user
-    filtered = filter_relationships(conf_user, all_rels)
     print_test_result(
         "Filter relationships - confidential user sees all",
-        len(filtered) == 2
+        len(conf_visible) == 2
     )
 
 
+class MockClient(NamedTuple):
+    """Stand-in client entity carrying NED fields"""
+    client_name: str = "Test Client"
+    relationship_strength: str = "Strong"
+    relationship_notes: str = "Confidential internal assessment"
+    client_priority: str = "High"
+    client_status: str = "Active"
+
+    def to_dict(self):
+        return self._asdict()
+
+
 def test_tier2_ned_permissions(admin, ned_user, conf_user, standard_user):
     """Test Tier 2: NED Team access"""
     print_test_header("Tier 2: NED Team Permissions")
 
-    # Create mock entity with NED fields
-    class MockClient:
-        def __init__(self):
-            self.client_name = "Test Client"
-            self.relationship_strength = "Strong"
-            self.relationship_notes = "Confidential internal assessment"
-            self.client_priority = "High"
-            self.client_status = "Active"
-
-        def to_dict(self):
-            return {
-                'client_name': self.client_name,
-                'relationship_strength': self.relationship_strength,
-                'relationship_notes': self.relationship_notes,
-                'client_priority': self.client_priority,
-                'client_status': self.client_status
-            }
-
+    # Mock entity with NED fields
     client = MockClient()
 
     # Test 1: Admin can view NED content
@@ -420,32 +483,40 @@ def test_query_filters(conf_rel, admin, conf_user, standard_user):
     """Test query filter helpers"""
     print_test_header("Query Filter Helpers")
 
+    # One grouped COUNT gives the expected visible totals for every user
+    counts = dict(
+        db_session.query(CompanyRoleAssignment.is_confidential, func.count())
+        .group_by(CompanyRoleAssignment.is_confidential)
+        .all()
+    )
+    total = sum(counts.values())
+
     # Test 1: Apply confidential filter - admin sees all
-    query = db_session.query(ProjectVendorRelationship)
-    filtered_query = apply_confidential_filter(query, admin, ProjectVendorRelationship)
-    result_count = filtered_query.count()
+    query = db_session.query(CompanyRoleAssignment)
+    filtered_query = apply_confidential_filter(query, admin, CompanyRoleAssignment)
     print_test_result(
-        f"Admin query filter - sees all relationships ({result_count} total)",
-        result_count >= 2  # At least our test relationships
+        f"Admin query filter - sees all relationships ({total} total)",
+        filtered_query.count() == total and total >= 2  # At least our test relationships
     )
 
     # Test 2: Apply confidential filter - confidential user sees all
-    query = db_session.query(ProjectVendorRelationship)
-    filtered_query = apply_confidential_filter(query, conf_user, ProjectVendorRelationship)
-    result_count = filtered_query.count()
+    query = db_session.query(CompanyRoleAssignment)
+    filtered_query = apply_confidential_filter(query, conf_user, CompanyRoleAssignment)
     print_test_result(
-        f"Confidential user query filter - sees all relationships ({result_count} total)",
-        result_count >= 2
+        f"Confidential user query filter - sees all relationships ({total} total)",
+        filtered_query.count() == total and total >= 2
     )
 
     # Test 3: Apply confidential filter - standard user sees only public
-    query = db_session.query(ProjectVendorRelationship)
-    filtered_query = apply_confidential_filter(query, standard_user, ProjectVendorRelationship)
-    # Check that all results have is_confidential=False
-    all_public = all(not rel.is_confidential for rel in filtered_query.all())
+    query = db_session.query(CompanyRoleAssignment)
+    filtered_query = apply_confidential_filter(query, standard_user, CompanyRoleAssignment)
+    # Probe for a leaked confidential row instead of loading every result
+    leaked = db_session.query(
+        filtered_query.filter(CompanyRoleAssignment.is_confidential.is_(True)).exists()
+    ).scalar()
     print_test_result(
         "Standard user query filter - sees only public relationships",
-        all_public
+        filtered_query.count() == counts.get(False, 0) and not leaked
     )
 
 
@@ -453,16 +524,16 @@ def cleanup_test_data():
     """Clean up test data"""
     print_test_header("Cleaning Up Test Data")
     cleanup_test_data_full()
-    print("✓ Cleaned up all test data")
+    _emit("✓ Cleaned up all test data")
 
 
 def main():
     """Run all permission tests"""
     global db_session
 
-    print("\n" + "=" * 70)
-    print("NUKEWORKS PERMISSION SYSTEM TEST SUITE")
-    print("=" * 70)
+    _emit("\n" + "=" * 70)
+    _emit("NUKEWORKS PERMISSION SYSTEM TEST SUITE")
+    _emit("=" * 70)
 
     # Create Flask app context
     app = create_app('development')
@@ -474,7 +545,8 @@ def main():
             admin, ned_user, conf_user, standard_user = setup_test_users()
             project, vendor, public_rel, conf_rel = setup_test_data(admin)
 
-            # Run tests
+            # Run tests one after another: the ORM objects above belong to
+            # this thread's session, and sessions are not thread-safe
             test_tier1_field_permissions(project, admin, conf_user, standard_user)
             test_tier1_relationship_permissions(public_rel, conf_rel, admin, conf_user, standard_user)
             test_tier2_ned_permissions(admin, ned_user, conf_user, standard_user)
@@ -484,12 +556,14 @@ def main():
             # Cleanup
             cleanup_test_data()
 
-            print("\n" + "=" * 70)
-            print("ALL TESTS COMPLETED SUCCESSFULLY ✓")
-            print("=" * 70 + "\n")
+            _emit("\n" + "=" * 70)
+            _emit("ALL TESTS COMPLETED SUCCESSFULLY ✓")
+            _emit("=" * 70 + "\n")
+            _flush_output()
 
         except Exception as e:
-            print(f"\n✗ TEST FAILED WITH ERROR: {e}")
+            _emit(f"\n✗ TEST FAILED WITH ERROR: {e}")
+            _flush_output()
             import traceback
             traceback.print_exc()
 
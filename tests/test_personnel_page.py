@@ -1,46 +1,27 @@
-#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Test script to verify personnel page renders without errors"""
-import sys
-import os
+"""Test that the personnel page route is wired up"""
+from flask import Flask
+from flask_login import LoginManager
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Set test environment
-os.environ['FLASK_ENV'] = 'development'
+def _routing_app():
+    """Bare Flask app carrying only the personnel blueprint (no database)"""
+    from app.routes.personnel import bp as personnel_bp
 
-def test_personnel_page():
-    """Test that the personnel list route works"""
-    try:
-        from app import create_app
-
-        # Create app
-        app = create_app()
-
-        with app.test_client() as client:
-            # Try to access the personnel page (should redirect to login)
-            response = client.get('/personnel/')
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(personnel_bp)
 
-            print(f"[OK] Personnel route exists")
-            print(f"[OK] Response status: {response.status_code}")
+    login_manager = LoginManager(app)
+    login_manager.login_view = '/auth/login'
+    login_manager.user_loader(lambda user_id: None)
+    return app
 
-            if response.status_code == 302:
-                print(f"[OK] Correctly redirects to login (not authenticated)")
-            elif response.status_code == 200:
-                print(f"[OK] Page rendered successfully")
-            else:
-                print(f"[WARN] Unexpected status code: {response.status_code}")
 
-            return True
-
-    except Exception as e:
-        print(f"[ERROR] Error testing personnel page: {type(e).__name__}")
-        print(f"        {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+def test_personnel_page():
+    """Test that the personnel list route works"""
+    with _routing_app().test_client() as client:
+        # Without a login the page redirects
+        response = client.get('/personnel/')
 
-if __name__ == '__main__':
-    success = test_personnel_page()
-    sys.exit(0 if success else 1)
+    assert response.status_code in (200, 302)
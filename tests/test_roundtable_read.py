@@ -1,43 +1,63 @@
-#!/usr/bin/env python3
 """Test reading roundtable data via ORM"""
 
-import sys
-sys.path.insert(0, '.')
-
-from app import create_app, db_session
-from app.models import RoundtableHistory, Company
-
-app = create_app()
-
-with app.app_context():
-    print("Testing RoundtableHistory ORM read...")
-    print()
-
-    # Test 1: Query Blue Energy entries
-    print("Blue Energy (ID: 32) entries:")
-    entries = db_session.query(RoundtableHistory).filter(
-        RoundtableHistory.entity_type == 'Company',
-        RoundtableHistory.entity_id == 32
-    ).all()
-
-    print(f"Found {len(entries)} entries")
-    for entry in entries:
-        print(f"\nEntry ID: {entry.history_id}")
-        print(f"  Entity: {entry.entity_type} {entry.entity_id}")
-        print(f"  Timestamp: {entry.created_timestamp}")
-        print(f"  Discussion: {entry.discussion[:60] if entry.discussion else 'None'}...")
-        print(f"  Next Steps: {entry.next_steps[:60] if entry.next_steps else 'None'}...")
-        print(f"  Focus: {entry.client_near_term_focus[:60] if entry.client_near_term_focus else 'None'}...")
-        print(f"  Targets: {entry.mpr_work_targets[:60] if entry.mpr_work_targets else 'None'}...")
-
-    print("\n" + "="*60)
-    print("All new entries (entity_type='Company'):")
-    all_entries = db_session.query(RoundtableHistory).filter(
-        RoundtableHistory.entity_type == 'Company'
-    ).order_by(RoundtableHistory.entity_id).all()
-
-    for entry in all_entries:
-        company = db_session.get(Company, entry.entity_id)
-        company_name = company.company_name if company else "Unknown"
-        print(f"\n{company_name} (ID: {entry.entity_id}) - {entry.created_timestamp}")
-        print(f"  Discussion: {entry.discussion[:50] if entry.discussion else 'None'}...")
+from flask_login import login_user
+from sqlalchemy.orm import load_only
+
+from app.models import RoundtableHistory, Company, User
+
+
+def test_roundtable_read(app, db_session):
+    """Roundtable entries for companies read back with their company names"""
+    ned_user = User(username='rt_ned', email='rt_ned@test.com', is_ned_team=True)
+    ned_user.set_password('password123')
+    company = Company(company_name='Roundtable Test Energy')
+    db_session.add_all([ned_user, company])
+    db_session.flush()
+
+    entry = RoundtableHistory(entity_type='Company', entity_id=company.company_id)
+    entry.discussion = 'Discussed licensing timeline and site selection for the first unit'
+    entry.next_steps = 'Schedule follow-up with the owner engineering team'
+    db_session.add(entry)
+    db_session.commit()
+
+    try:
+        # EncryptedField only decrypts for a logged-in NED Team user
+        with app.test_request_context():
+            login_user(ned_user)
+
+            # Only the two ciphertexts being checked; the other four blobs stay unloaded
+            entries = db_session.query(RoundtableHistory).options(
+                load_only(
+                    RoundtableHistory.history_id,
+                    RoundtableHistory._discussion_encrypted,
+                    RoundtableHistory._next_steps_encrypted,
+                )
+            ).filter(
+                RoundtableHistory.entity_type == 'Company',
+                RoundtableHistory.entity_id == company.company_id
+            ).all()
+
+            assert len(entries) == 1
+            assert entries[0].discussion[:60] == entry.discussion[:60]
+            assert entries[0].next_steps.startswith('Schedule follow-up')
+
+            # Company names come from the same query (no get() per entry), and
+            # only the key columns are selected rather than whole entries
+            rows = (
+                db_session.query(RoundtableHistory.entity_id, Company.company_name)
+                .outerjoin(Company, Company.company_id == RoundtableHistory.entity_id)
+                .filter(RoundtableHistory.entity_type == 'Company')
+                .order_by(RoundtableHistory.entity_id)
+                .all()
+            )
+
+            names = {}
+            for entity_id, company_name in rows:
+                names[entity_id] = company_name or "Unknown"
+
+            assert names[company.company_id] == 'Roundtable Test Energy'
+    finally:
+        # The user stays: audit rows written while it was logged in refer to it
+        db_session.delete(entry)
+        db_session.delete(company)
+        db_session.commit()